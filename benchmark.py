@@ -0,0 +1,245 @@
+"""
+Benchmark untuk program split image
+Membuat gambar sintetis berbagai ukuran dan format (dari generator create_demo.py),
+lalu mengukur kecepatan split_image untuk mode pixel dan rasio.
+
+Hasil disimpan sebagai JSON agar bisa dibandingkan antar commit:
+    python benchmark.py --sizes 1,16,64 --formats png,jpg --tiles 256,512 --workers 1,4
+    python benchmark.py --sizes 500 --formats tif --tiles 1024 --output hasil_500mp.json
+
+Waktu startup (import split_image) bisa dicek terhadap budget, mis. di CI:
+    python benchmark.py --check-startup
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+
+from PIL import Image
+
+import split_image
+from create_demo import create_test_image
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Folder cache gambar sintetis (dibuat sekali, dipakai ulang antar run)
+BENCH_INPUT_DIR = 'bench_inputs'
+
+# Budget waktu import split_image dalam ms (terukur ~20 ms, sebelum import lazy ~85 ms)
+STARTUP_BUDGET_MS = 40
+
+# Modul berat yang tidak boleh ikut dimuat oleh import split_image
+STARTUP_FORBIDDEN_MODULES = ('PIL', 'argparse', 'concurrent.futures', 'hashlib', 'mmap', 'shutil',
+                             'subprocess', 'zipfile')
+
+def generate_input(megapixels, image_format, input_dir=BENCH_INPUT_DIR):
+    """Membuat (atau memakai ulang) gambar sintetis sebesar megapixels dalam format tertentu.
+
+    Gambar test 800x600 dari create_demo.py disusun berulang sampai ukuran
+    target, sehingga isinya deterministik dan mirip gambar nyata (gradien,
+    garis, teks) tanpa perlu menggambar ulang setiap pixel.
+    """
+    os.makedirs(input_dir, exist_ok=True)
+    path = os.path.join(input_dir, f"bench_{megapixels}mp.{image_format}")
+    if os.path.exists(path):
+        return path
+
+    # Rasio 4:3 seperti gambar demo
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(megapixels * 1_000_000 / width)
+
+    pattern = create_test_image()
+    canvas = Image.new('RGB', (width, height))
+    for top in range(0, height, pattern.height):
+        for left in range(0, width, pattern.width):
+            canvas.paste(pattern, (left, top))
+
+    print(f"🎨 Membuat input {path} ({width}x{height}px)...")
+    canvas.save(path)
+    return path
+
+def peak_rss_mb():
+    """Peak RSS proses ini dalam MB, atau None jika tidak didukung"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_case(case):
+    """Menjalankan satu kasus benchmark di proses ini dan mengembalikan hasilnya"""
+    image_path = case['input']
+    # open_image memakai batas pixel split_image (tanpa batas), bukan default Pillow ~179 MP
+    with split_image.open_image(image_path) as img:
+        width, height = img.size
+        pixel_bytes = width * height * len(img.getbands())
+
+    output_dir = tempfile.mkdtemp(prefix='split_bench_')
+    try:
+        if case['mode'] == 'pixel':
+            params = {'width': case['tile'], 'height': case['tile'], 'encode_pool': case['encode_pool']}
+        else:
+            params = {'ratio': case['ratio']}
+
+        start = time.perf_counter()
+        # Opsi sama dengan default CLI
+        results = split_image.split(image_path, output_dir, case['mode'], workers=case['workers'],
+                                    encode_profile=case['profile'], streaming=True, memory_map=True, **params)
+        wall_time = time.perf_counter() - start
+        rss = peak_rss_mb()
+
+        output_bytes = sum(os.path.getsize(os.path.join(root, name))
+                           for root, _, names in os.walk(output_dir) for name in names)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    tiles = sum(result.tiles for result in results)
+    # Waktu per tahap dari run yang sama (SplitResult.metrics), dijumlah dari semua worker
+    summary = split_image.summarize_metrics(results, wall_time)
+    return dict(case, width=width, height=height, success=all(results), tiles=tiles,
+                wall_s=wall_time, tiles_per_s=tiles / wall_time if wall_time else None,
+                mb_per_s=pixel_bytes / (1024 * 1024) / wall_time if wall_time else None,
+                output_mb=output_bytes / (1024 * 1024), peak_rss_mb=rss,
+                stages={f"{stage}_s": summary[f"{stage}_s"] for stage in split_image.METRIC_STAGES},
+                error=next((result.error for result in results if not result), None))
+
+def run_case_subprocess(case):
+    """Menjalankan satu kasus di proses terpisah agar peak RSS tidak tercampur antar kasus"""
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(case)],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return dict(case, success=False, error=completed.stderr.strip().splitlines()[-1:])
+    return json.loads(completed.stdout)
+
+def measure_startup(runs=5):
+    """Mengukur import split_image dengan python -X importtime di proses baru.
+
+    Bytecode cache diaktifkan (seperti pemakaian normal) dan hasil terbaik
+    dari beberapa run dipakai agar tidak terpengaruh noise. Mengembalikan
+    (waktu kumulatif dalam ms, daftar modul yang ikut di-import).
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    timings = []
+    for run in range(runs + 1):  # run pertama hanya untuk menulis __pycache__
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import split_image'],
+                                   capture_output=True, text=True, env=env, check=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        # Format baris: "import time: <self us> | <kumulatif us> | <nama modul>"
+        rows = [line.split('|') for line in completed.stderr.splitlines() if line.startswith('import time:')]
+        rows = [(int(row[1]), row[2].strip()) for row in rows if row[1].strip().isdigit()]
+        if run > 0:
+            timings.append(next(us for us, name in rows if name == 'split_image'))
+    return min(timings) / 1000, [name for _, name in rows]
+
+def check_startup(budget_ms=STARTUP_BUDGET_MS):
+    """Memeriksa waktu import split_image dan modul berat yang ikut dimuat. Mengembalikan exit code"""
+    startup_ms, modules = measure_startup()
+    forbidden = [name for name in STARTUP_FORBIDDEN_MODULES if name in modules]
+    print(f"⏱️  import split_image: {startup_ms:.1f} ms (budget {budget_ms} ms)")
+    if forbidden:
+        print(f"   ❌ Modul berat ikut di-import saat startup: {', '.join(forbidden)}")
+    if startup_ms > budget_ms:
+        print(f"   ❌ Melebihi budget startup sebesar {startup_ms - budget_ms:.1f} ms")
+    if forbidden or startup_ms > budget_ms:
+        return 1
+    print("   ✅ Startup sesuai budget")
+    return 0
+
+def git_revision():
+    """Commit git saat ini (untuk membandingkan hasil antar commit), atau None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def parse_list(text, cast=str):
+    return [cast(item) for item in text.split(',') if item]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark split_image dengan gambar sintetis")
+    parser.add_argument('--sizes', type=lambda text: parse_list(text, int), default=[1, 16, 64],
+                        help="ukuran gambar dalam megapixel, mis. 1,16,64,500 (default: 1,16,64)")
+    parser.add_argument('--formats', type=parse_list, default=['png', 'jpg', 'tif'],
+                        help="format input (default: png,jpg,tif)")
+    parser.add_argument('--tiles', type=lambda text: parse_list(text, int), default=[256, 512, 1024],
+                        help="ukuran potongan persegi untuk mode pixel (default: 256,512,1024)")
+    parser.add_argument('--ratios', type=parse_list, default=['4:5'],
+                        help="rasio untuk mode ratio (default: 4:5)")
+    parser.add_argument('--workers', type=lambda text: parse_list(text, int), default=[1, split_image.DEFAULT_WORKERS],
+                        help="jumlah worker yang diuji (default: 1 dan jumlah CPU)")
+    parser.add_argument('--encode-pools', type=parse_list, default=[split_image.DEFAULT_ENCODE_POOL],
+                        help="pool encode yang diuji untuk mode pixel, mis. thread,process (default: thread)")
+    parser.add_argument('--profile', default=split_image.DEFAULT_ENCODE_PROFILE, choices=tuple(split_image.ENCODE_PROFILES))
+    parser.add_argument('--output', default='bench_results.json', help="file hasil JSON (default: bench_results.json)")
+    parser.add_argument('--check-startup', action='store_true',
+                        help="hanya cek waktu import split_image terhadap budget (exit code 1 jika lewat)")
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f"budget waktu import split_image dalam ms (default: {STARTUP_BUDGET_MS})")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.check_startup:
+        return check_startup(args.startup_budget_ms)
+
+    if args.run_case:
+        # Mode internal: dipanggil oleh run_case_subprocess
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    cases = []
+    for megapixels in args.sizes:
+        for image_format in args.formats:
+            image_path = generate_input(megapixels, image_format)
+            for workers in sorted(set(args.workers)):
+                for tile in args.tiles:
+                    for encode_pool in args.encode_pools:
+                        cases.append({'input': image_path, 'megapixels': megapixels, 'format': image_format,
+                                      'mode': 'pixel', 'tile': tile, 'workers': workers, 'profile': args.profile,
+                                      'encode_pool': encode_pool})
+            # Mode rasio tidak memakai workers: cukup satu kasus per rasio
+            for ratio in args.ratios:
+                cases.append({'input': image_path, 'megapixels': megapixels, 'format': image_format,
+                              'mode': 'ratio', 'ratio': ratio, 'workers': 1, 'profile': args.profile})
+
+    print(f"🚀 Menjalankan {len(cases)} kasus benchmark...")
+    results = []
+    for i, case in enumerate(cases, 1):
+        result = run_case_subprocess(case)
+        results.append(result)
+        label = f"{case['megapixels']}MP {case['format']} {case['mode']} " + \
+            (f"{case['tile']}px {case['encode_pool']}" if case['mode'] == 'pixel' else case['ratio']) + \
+            f" w={case['workers']}"
+        if result.get('success'):
+            stages = ', '.join(f"{stage} {result['stages'][f'{stage}_s']:.2f}s" for stage in split_image.METRIC_STAGES)
+            print(f"   ✅ [{i}/{len(cases)}] {label}: {result['wall_s']:.2f}s, "
+                  f"{result['tiles_per_s']:.1f} tile/s, {result['mb_per_s']:.1f} MB/s ({stages})")
+        else:
+            print(f"   ❌ [{i}/{len(cases)}] {label}: {result.get('error')}")
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pillow': Image.__version__,
+        'cpu_count': os.cpu_count(),
+        'startup_import_ms': measure_startup()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 Hasil disimpan di: {args.output}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Smoke test untuk program split image
+Membuat gambar test (dari generator create_demo.py) di folder sementara, lalu
+menjalankan mode non-interaktif (run_cli) untuk semua mode dan sink utama,
+server tile, serta mode interaktif (main) dengan input dari stdin. Bukan
+test lengkap: hanya memastikan setiap jalur utama berjalan dan menghasilkan
+potongan.
+
+    python smoke_test.py
+
+Exit code 1 jika ada pemeriksaan yang gagal.
+"""
+
+import os
+import io
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer
+
+from PIL import Image
+
+import split_image
+import tile_server
+from create_demo import create_test_image
+
+SPLIT_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'split_image.py')
+
+def create_inputs(images_dir):
+    """Membuat gambar test 800x600 (PNG, JPG) dan GIF animasi kecil"""
+    os.makedirs(images_dir, exist_ok=True)
+    img = create_test_image()
+    img.save(os.path.join(images_dir, 'demo.png'))
+    img.save(os.path.join(images_dir, 'demo.jpg'), quality=90)
+
+    frames = [img.resize((200, 150)).rotate(angle) for angle in (0, 90, 180)]
+    frames[0].save(os.path.join(images_dir, 'anim.gif'), save_all=True, append_images=frames[1:],
+                   duration=100, loop=0)
+
+def run_cli_json(argv):
+    """Menjalankan run_cli dengan --json; mengembalikan (exit code, list hasil per gambar)"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        code = split_image.run_cli(argv + ['--json'])
+    return code, json.loads(output.getvalue())
+
+def count_files(folder, suffix=''):
+    return sum(1 for _, _, names in os.walk(folder) for name in names
+               if name.endswith(suffix) and not name.startswith('.'))
+
+def run_interactive(work_dir, answers):
+    """Menjalankan split_image.py tanpa argumen dengan jawaban prompt dari stdin"""
+    return subprocess.run([sys.executable, SPLIT_IMAGE_PATH], cwd=work_dir, input='\n'.join(answers) + '\n',
+                          capture_output=True, text=True, encoding='utf-8', timeout=300)
+
+def check_pixel(work_dir):
+    output_dir = os.path.join(work_dir, 'out_pixel')
+    code, results = run_cli_json([os.path.join(work_dir, 'images', 'demo.png'), '-s', '200x150', '-o', output_dir])
+    # 800x600 dipotong 200x150 = 4 kolom x 4 baris
+    return code == 0 and results[0]['tiles'] == 16 and count_files(output_dir, '.png') == 16
+
+def check_incremental(work_dir):
+    output_dir = os.path.join(work_dir, 'out_incremental')
+    argv = [os.path.join(work_dir, 'images', 'demo.jpg'), '-s', '256x256', '-o', output_dir, '--incremental']
+    first_code, first = run_cli_json(argv)
+    second_code, second = run_cli_json(argv)
+    # Run kedua tidak mengubah apa pun: semua potongan dilewati
+    return first_code == 0 and second_code == 0 and first[0]['tiles'] == 12 and second[0]['tiles'] == 0
+
+def check_ratio(work_dir):
+    output_dir = os.path.join(work_dir, 'out_ratio')
+    code, results = run_cli_json([os.path.join(work_dir, 'images', 'demo.png'), '-m', 'ratio', '-r', '4:5',
+                                  '-o', output_dir])
+    return code == 0 and results[0]['tiles'] >= 2 and \
+        os.path.exists(os.path.join(output_dir, 'demo', split_image.RATIO_PLAN_FILENAME))
+
+def check_dzi(work_dir):
+    output_dir = os.path.join(work_dir, 'out_dzi')
+    code, results = run_cli_json([os.path.join(work_dir, 'images', 'demo.png'), '-m', 'dzi', '-o', output_dir])
+    return code == 0 and results[0]['tiles'] > 0 and os.path.exists(os.path.join(output_dir, 'demo.dzi'))
+
+def check_xyz(work_dir):
+    output_dir = os.path.join(work_dir, 'out_xyz')
+    code, results = run_cli_json([os.path.join(work_dir, 'images', 'demo.png'), '-m', 'xyz', '-o', output_dir])
+    # Semua tile XYZ persegi penuh, termasuk tile tepi
+    with Image.open(os.path.join(output_dir, 'demo', '0', '0', '0.png')) as tile:
+        return code == 0 and tile.size == (256, 256)
+
+def check_sinks(work_dir):
+    ok = True
+    for sink in ('zip', 'pack', 'npy'):
+        output_dir = os.path.join(work_dir, f'out_{sink}')
+        code, results = run_cli_json([os.path.join(work_dir, 'images', 'demo.png'), '-s', '256x256',
+                                      '-o', output_dir, '--sink', sink])
+        ok = ok and code == 0 and results[0]['tiles'] == 12 and os.path.isfile(results[0]['location'])
+    pack_path = os.path.join(work_dir, 'out_pack', 'demo', 'demo_pixel.pack')
+    with Image.open(io.BytesIO(split_image.read_packed_tile(pack_path, 3, 4))) as tile:
+        return ok and tile.size == (32, 88)
+
+def check_batch_resume(work_dir):
+    output_dir = os.path.join(work_dir, 'out_batch')
+    code, results = run_cli_json([os.path.join(work_dir, 'images'), '-s', '256x256', '-o', output_dir,
+                                  '--resume', '--frames'])
+    # Jurnal dihapus setelah semua gambar selesai
+    journals = [name for name in os.listdir(output_dir) if name.startswith('.split_journal')]
+    return code == 0 and len(results) == 3 and all(result['success'] for result in results) and not journals
+
+def check_invalid_input(work_dir):
+    empty_dir = os.path.join(work_dir, 'empty')
+    os.makedirs(empty_dir, exist_ok=True)
+    # Folder tanpa gambar bukan run yang berhasil
+    code, results = run_cli_json([empty_dir, '-s', '256x256', '-o', os.path.join(work_dir, 'out_empty')])
+    try:
+        split_image.split(os.path.join(work_dir, 'images', 'demo.png'), os.path.join(work_dir, 'out_bad'),
+                          'ratio', ratio='bad')
+        ratio_error = False
+    except ValueError:
+        ratio_error = True
+    return code == 1 and results == [] and ratio_error
+
+def http_get(url):
+    """GET url; mengembalikan (status, header X-Tile-Cache)"""
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            return response.status, response.headers.get('X-Tile-Cache')
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+def check_tile_server(work_dir):
+    tile_source = tile_server.TileSource(os.path.join(work_dir, 'images'))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), tile_server.make_handler(tile_source))
+    server.verbose = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        first = http_get(f"{base_url}/demo.png/256x256/1/1")
+        second = http_get(f"{base_url}/demo.png/256x256/1/1")
+        # 800x600 dipotong 256x256 = 3 baris; baris 4 di luar gambar
+        outside = http_get(f"{base_url}/demo.png/256x256/4/1")
+        traversal = http_get(f"{base_url}/..%2Fimages%2Fdemo.png/256x256/1/1")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return first == (200, 'miss') and second == (200, 'hit') and outside[0] == 404 and traversal[0] == 404
+
+def check_interactive_pixel(work_dir):
+    completed = run_interactive(work_dir, ['2', '1', '256', '256', ''])
+    return completed.returncode == 0 and "Berhasil: 1/1" in completed.stdout
+
+def check_interactive_ratio(work_dir):
+    completed = run_interactive(work_dir, ['2', '2', '4:5', '', ''])
+    return completed.returncode == 0 and "Berhasil: 1/1" in completed.stdout
+
+CHECKS = [
+    ("CLI mode pixel", check_pixel),
+    ("CLI mode pixel --incremental", check_incremental),
+    ("CLI mode ratio", check_ratio),
+    ("CLI mode dzi", check_dzi),
+    ("CLI mode xyz", check_xyz),
+    ("CLI sink zip/pack/npy", check_sinks),
+    ("CLI batch folder --resume --frames", check_batch_resume),
+    ("CLI folder kosong dan rasio tidak valid", check_invalid_input),
+    ("Server tile (cache, 404)", check_tile_server),
+    ("Interaktif mode pixel", check_interactive_pixel),
+    ("Interaktif mode rasio", check_interactive_ratio),
+]
+
+def main():
+    print("🧪 Smoke test split image")
+    print("=" * 50)
+    work_dir = tempfile.mkdtemp(prefix='split_smoke_')
+    failed = 0
+    try:
+        create_inputs(os.path.join(work_dir, 'images'))
+        for name, check in CHECKS:
+            try:
+                ok = check(work_dir)
+                error = None
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            if ok:
+                print(f"   ✅ {name}")
+            else:
+                failed += 1
+                print(f"   ❌ {name}" + (f" ({error})" if error else ""))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("=" * 50)
+    print(f"📊 {len(CHECKS) - failed}/{len(CHECKS)} pemeriksaan berhasil")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""
+Entry point ringan untuk split_image.py
+Python tidak menyimpan bytecode untuk file yang dijalankan langsung, sehingga
+`python split_image.py` meng-compile ulang seluruh modul di setiap start.
+File ini hanya meng-import split_image (memakai cache __pycache__) lalu
+menjalankan program yang sama, dengan atau tanpa argumen:
+
+    python split.py
+    python split.py images -s 512x512 -o output
+"""
+
+import sys
+
+import split_image
+
+if __name__ == "__main__":
+    sys.exit(split_image.entry_point())
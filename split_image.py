@@ -11,35 +11,285 @@ Cara penggunaan:
 
 import os
 import sys
-from PIL import Image
+import io
+import json
+import struct
+import time
+import queue
+import importlib
+import threading
+from contextlib import contextmanager
+from collections import deque, namedtuple
+from functools import lru_cache
 import math
 
-def get_available_images():
+class _LazyModule:
+    """Modul yang baru di-import saat atributnya pertama kali dipakai.
+
+    Daftar gambar dari cache, --help, dan parsing argumen tidak memakai
+    Pillow, zipfile, subprocess, dll., jadi modul-modul itu tidak perlu
+    dimuat saat startup (lihat benchmark.py --check-startup).
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        if attr.startswith('_'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._load(), attr, value)
+
+Image = _LazyModule('PIL.Image')
+argparse = _LazyModule('argparse')
+futures = _LazyModule('concurrent.futures')
+multiprocessing = _LazyModule('multiprocessing')
+hashlib = _LazyModule('hashlib')
+mmap = _LazyModule('mmap')
+shutil = _LazyModule('shutil')
+subprocess = _LazyModule('subprocess')
+zipfile = _LazyModule('zipfile')
+
+# Jumlah worker default untuk encoding potongan secara paralel
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Batas perkiraan memori (MB) untuk gambar yang diproses bersamaan di mode batch
+DEFAULT_BATCH_MEMORY_MB = 2048
+
+# Nama file manifest untuk mode incremental (satu per mode, di folder output gambar)
+MANIFEST_FILENAME = '.split_manifest_{mode}.json'
+
+# Jurnal job di folder output untuk melanjutkan job yang terhenti (lihat JobJournal),
+# satu file per job (hash parameter dan input) agar job bersamaan tidak saling menimpa
+JOURNAL_FILENAME = '.split_journal_{job}.jsonl'
+
+# Akhiran file yang sedang ditulis; di-rename ke nama akhir setelah lengkap
+PARTIAL_SUFFIX = '.part'
+
+# Rencana potongan mode rasio yang terakhir dipakai (lihat save_ratio_plan)
+RATIO_PLAN_FILENAME = '.split_plan_ratio.json'
+
+# Peta potongan yang tidak ditulis (kosong/duplikat) ke potongan pengganti
+TILE_MAP_FILENAME = '.split_tilemap_{mode}.json'
+
+# Profil encoding per format Pillow: kecepatan vs ukuran file.
+# 'smallest' memakai kualitas perilaku lama (quality=95, optimize=True);
+# WebP ditambah method=6 yang hanya memperkecil file, kualitas tetap.
+ENCODE_PROFILES = {
+    'fast': {
+        'JPEG': {'quality': 95, 'optimize': False},
+        'PNG': {'compress_level': 1},
+        'WEBP': {'quality': 90, 'method': 0},
+        'GIF': {'optimize': False},
+    },
+    'balanced': {
+        'JPEG': {'quality': 95, 'optimize': True},
+        'PNG': {'compress_level': 6},
+        'WEBP': {'quality': 90, 'method': 4},
+        'GIF': {'optimize': False},
+    },
+    'smallest': {
+        'JPEG': {'quality': 95, 'optimize': True},
+        'PNG': {'optimize': True},
+        'WEBP': {'quality': 95, 'method': 6},
+        'GIF': {'optimize': True},
+    },
+}
+DEFAULT_ENCODE_PROFILE = 'smallest'
+
+# Mode gambar yang bisa disimpan langsung sebagai JPEG
+JPEG_MODES = ('RGB', 'L', 'CMYK')
+
+# Penanda file pack dan footer-nya: (offset indeks, panjang indeks, magic)
+PACK_MAGIC = b'SPLTPAK1'
+PACK_FOOTER = struct.Struct('<QQ8s')
+
+# Jumlah potongan ter-encode yang boleh antre menunggu ditulis (0 = tulis langsung)
+DEFAULT_WRITE_QUEUE = 16
+
+# Buffer tulis untuk container agar I/O berurutan dalam blok besar
+CONTAINER_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Ekstensi gambar yang diproses
+SUPPORTED_FORMATS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp')
+
+# Batas pixel gambar sumber untuk proteksi decompression bomb Pillow
+# (Image.MAX_IMAGE_PIXELS). None = tanpa batas: input berasal dari file lokal,
+# dan gambar yang lebih besar dari RAM dibaca per band atau dengan mmap.
+# Ubah dengan set_max_image_pixels() atau --max-image-pixels. Hanya berlaku
+# untuk open_image; Image.MAX_IMAGE_PIXELS milik aplikasi lain tidak diubah.
+MAX_IMAGE_PIXELS = None
+
+# Image.MAX_IMAGE_PIXELS global: diganti sementara saat open_image dari banyak thread
+_max_pixels_lock = threading.Lock()
+
+# Format Pillow per ekstensi, tanpa Image.registered_extensions() yang memuat semua plugin
+IMAGE_FORMATS = {'.png': 'PNG', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.gif': 'GIF', '.bmp': 'BMP',
+                 '.tif': 'TIFF', '.tiff': 'TIFF', '.webp': 'WEBP'}
+
+# Modul plugin Pillow per format (lihat load_image_plugin)
+IMAGE_PLUGINS = {'PNG': 'PngImagePlugin', 'JPEG': 'JpegImagePlugin', 'GIF': 'GifImagePlugin',
+                 'BMP': 'BmpImagePlugin', 'TIFF': 'TiffImagePlugin', 'WEBP': 'WebPImagePlugin'}
+
+# Cache dimensi gambar di folder images: nama -> [mtime_ns, ukuran file, lebar, tinggi]
+DIMENSION_INDEX_FILENAME = '.split_image_index.json'
+
+# Jumlah gambar per halaman di daftar interaktif
+IMAGES_PER_PAGE = 50
+
+# Tahap yang diukur waktunya di setiap pemotongan
+METRIC_STAGES = ('decode', 'crop', 'encode', 'write')
+
+# Cara menangani sisa gambar di mode rasio (lihat plan_ratio_tiles)
+RATIO_LEFTOVERS = ('crop', 'pad', 'distribute')
+# Default: seluruh gambar tercakup tanpa padding (crop bisa membuang hampir separuh gambar)
+DEFAULT_RATIO_LEFTOVER = 'distribute'
+
+# Pool untuk encode paralel (workers > 1). Thread berbagi gambar ter-decode tanpa
+# menyalin, tapi hanya skala ke banyak core jika encoder Pillow melepas GIL; ini
+# tergantung versi/build Pillow dan format (ukur dengan benchmark.py --encode-pools).
+# 'process' meng-encode di proses terpisah: potongan dikirim sebagai bytes.
+ENCODE_POOLS = ('thread', 'process')
+DEFAULT_ENCODE_POOL = 'thread'
+
+# Interval minimum (detik) antar update progress bar
+PROGRESS_INTERVAL = 0.2
+
+def get_available_images(images_dir=None):
     """Mendapatkan daftar gambar yang tersedia di folder images"""
-    images_dir = os.path.join(os.getcwd(), 'images')
+    if images_dir is None:
+        images_dir = os.path.join(os.getcwd(), 'images')
     if not os.path.exists(images_dir):
         print("❌ Folder 'images' tidak ditemukan!")
         return []
     
-    supported_formats = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp')
-    images = []
+    # scandir tidak membuat objek stat/path tambahan untuk setiap file
+    with os.scandir(images_dir) as entries:
+        images = [entry.name for entry in entries
+                  if entry.name.lower().endswith(SUPPORTED_FORMATS) and entry.is_file()]
+    
+    return sorted(images)
+
+def load_image_plugin(format_name):
+    """Memuat plugin Pillow untuk satu format saja.
+
+    Tanpa ini Pillow memuat semua plugin (Image.init, puluhan ms) untuk
+    format di luar BMP/GIF/JPEG/PNG/PPM, baik saat membuka maupun menyimpan.
+    """
+    plugin = IMAGE_PLUGINS.get(format_name)
+    if plugin is not None:
+        importlib.import_module('PIL.' + plugin)
+
+def set_max_image_pixels(limit):
+    """Mengatur batas pixel gambar sumber (None = tanpa batas, lihat MAX_IMAGE_PIXELS)"""
+    global MAX_IMAGE_PIXELS
+    MAX_IMAGE_PIXELS = limit
+
+def open_image(image_path):
+    """Image.open dengan hanya plugin untuk ekstensi file yang dimuat.
+
+    Isi file tetap dikenali dari header-nya; jika ekstensi tidak cocok,
+    Pillow sendiri kembali memuat semua plugin. Batas decompression bomb
+    mengikuti MAX_IMAGE_PIXELS, bukan default Pillow (~179 MP), agar
+    gambar raksasa bisa sampai ke pembacaan per band/mmap. Nilai
+    Image.MAX_IMAGE_PIXELS dikembalikan setelah header dibaca.
+    """
+    load_image_plugin(IMAGE_FORMATS.get(os.path.splitext(image_path)[1].lower()))
+    with _max_pixels_lock:
+        previous = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+        try:
+            return Image.open(image_path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = previous
+
+@lru_cache(maxsize=None)
+def jpegtran_path():
+    """Path jpegtran (libjpeg/libjpeg-turbo) untuk memotong JPEG tanpa decode/re-encode, atau None"""
+    return shutil.which('jpegtran')
+
+def read_image_size(image_path):
+    """Membaca (lebar, tinggi) dari header saja, atau None jika gagal"""
+    try:
+        with open_image(image_path) as img:
+            return img.size
+    except Exception:
+        return None
+
+def get_image_dimensions(images, images_dir='images', workers=DEFAULT_WORKERS):
+    """Mendapatkan dimensi gambar dengan cache di DIMENSION_INDEX_FILENAME.
+
+    Entri cache dipakai jika mtime dan ukuran file sama; hanya file baru atau
+    berubah yang header-nya dibaca, secara paralel. Mengembalikan dict
+    nama -> (lebar, tinggi) atau None.
+    """
+    index_path = os.path.join(images_dir, DIMENSION_INDEX_FILENAME)
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    
+    dimensions = {}
+    stale = []
+    for name in images:
+        try:
+            stat = os.stat(os.path.join(images_dir, name))
+        except OSError:
+            dimensions[name] = None
+            continue
+        entry = index.get(name)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            dimensions[name] = (entry[2], entry[3])
+        else:
+            stale.append((name, stat))
     
-    for file in os.listdir(images_dir):
-        if file.lower().endswith(supported_formats):
-            images.append(file)
+    if stale:
+        with futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            sizes = executor.map(read_image_size, [os.path.join(images_dir, name) for name, _ in stale])
+            for (name, stat), size in zip(stale, sizes):
+                dimensions[name] = size
+                if size is not None:
+                    index[name] = [stat.st_mtime_ns, stat.st_size, size[0], size[1]]
+        
+        try:
+            tmp_path = index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # Folder read-only: cache hanya tidak disimpan
+            pass
     
-    return images
+    return dimensions
+
+def display_images(images, page=0, images_dir='images'):
+    """Menampilkan satu halaman daftar gambar yang tersedia.
 
-def display_images(images):
-    """Menampilkan daftar gambar yang tersedia"""
-    print("\n📁 Gambar yang tersedia:")
+    Hanya dimensi gambar di halaman ini yang dibaca, sehingga waktu tampil
+    tidak bertambah dengan jumlah gambar di folder.
+    """
+    start = page * IMAGES_PER_PAGE
+    page_images = images[start:start + IMAGES_PER_PAGE]
+    dimensions = get_image_dimensions(page_images, images_dir)
+    
+    pages = max(1, math.ceil(len(images) / IMAGES_PER_PAGE))
+    print(f"\n📁 Gambar yang tersedia (halaman {page + 1}/{pages}, total {len(images)}):")
     print("-" * 40)
-    for i, image in enumerate(images, 1):
-        image_path = os.path.join('images', image)
-        try:
-            with Image.open(image_path) as img:
-                print(f"{i}. {image} ({img.width}x{img.height}px)")
-        except Exception as e:
+    for i, image in enumerate(page_images, start + 1):
+        size = dimensions.get(image)
+        if size is not None:
+            print(f"{i}. {image} ({size[0]}x{size[1]}px)")
+        else:
             print(f"{i}. {image} (tidak dapat membaca dimensi)")
 
 def get_user_input():
@@ -116,152 +366,2073 @@ def get_user_input():
         
         return 'ratio', ratio_w, ratio_h
 
-def split_image_by_pixel(image_path, output_dir, split_width, split_height):
-    """Memotong gambar berdasarkan dimensi pixel yang ditentukan"""
+def get_leftover_choice():
+    """Menanyakan cara menangani sisa gambar di mode rasio (lihat plan_ratio_tiles)"""
+    descriptions = {
+        'distribute': "potongan sedikit bertumpuk, seluruh gambar tercakup",
+        'pad': "potongan tepi diisi warna hitam",
+        'crop': "sisa gambar dibuang sama rata di kedua sisi",
+    }
+    choices = [DEFAULT_RATIO_LEFTOVER] + [name for name in RATIO_LEFTOVERS if name != DEFAULT_RATIO_LEFTOVER]
+    print("\nSisa gambar yang tidak pas dengan rasio:")
+    for i, name in enumerate(choices, 1):
+        print(f"{i}. {name} - {descriptions[name]}" + (" (default)" if i == 1 else ""))
+    
+    while True:
+        choice = input(f"Pilih cara (1-{len(choices)}, Enter = {DEFAULT_RATIO_LEFTOVER}): ").strip()
+        if not choice:
+            return DEFAULT_RATIO_LEFTOVER
+        if choice in [str(i) for i in range(1, len(choices) + 1)]:
+            return choices[int(choice) - 1]
+        print(f"❌ Pilih 1-{len(choices)}!")
+
+class SplitResult:
+    """Hasil pemotongan satu gambar. Bernilai True jika berhasil, sehingga
+    bisa dipakai seperti nilai boolean lama."""
+    
+    def __init__(self, image_path, success, tiles=0, skipped=0, location=None, error=None, metrics=None):
+        self.image_path = image_path
+        self.success = success
+        self.tiles = tiles
+        self.skipped = skipped
+        self.location = location
+        self.error = error
+        self.metrics = metrics or {}
+    
+    def __bool__(self):
+        return self.success
+    
+    def __repr__(self):
+        return f"SplitResult({self.as_dict()!r})"
+    
+    def as_dict(self):
+        return {'image': self.image_path, 'success': self.success, 'tiles': self.tiles,
+                'skipped': self.skipped, 'location': self.location, 'error': self.error,
+                'metrics': self.metrics}
+
+class SplitMetrics:
+    """Mengumpulkan waktu per tahap (decode, crop, encode, write) dan byte tertulis.
+
+    Aman dipanggil dari thread worker. Waktu encode adalah jumlah dari semua
+    worker, jadi bisa lebih besar dari waktu total saat paralel.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = dict.fromkeys(METRIC_STAGES, 0.0)
+        self.bytes_written = 0
+        self.lock = threading.Lock()
+    
+    def add(self, stage, seconds):
+        with self.lock:
+            self.seconds[stage] += seconds
+    
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+    
+    def timed(self, stage, function, *args):
+        """Memanggil function(*args) dan mencatat waktunya pada tahap stage"""
+        with self.stage(stage):
+            return function(*args)
+    
+    def add_bytes(self, count):
+        with self.lock:
+            self.bytes_written += count
+    
+    def as_dict(self, tiles):
+        wall = time.perf_counter() - self.started
+        result = {f"{stage}_s": round(seconds, 6) for stage, seconds in self.seconds.items()}
+        result.update(wall_s=round(wall, 6), bytes_written=self.bytes_written,
+                      tiles_per_s=round(tiles / wall, 3) if wall > 0 else None)
+        return result
+
+class ProgressReporter:
+    """Menampilkan progress potongan.
+
+    style 'tiles' mencetak satu baris per potongan (perilaku lama), 'bar'
+    menampilkan satu baris progress yang diperbarui paling sering setiap
+    PROGRESS_INTERVAL detik, dan 'none' tidak menampilkan apa pun.
+    """
+    
+    def __init__(self, total, style='tiles', log=print):
+        self.total = total
+        self.style = style
+        self.log = log
+        self.started = time.perf_counter()
+        self.last_update = 0.0
+    
+    def update(self, count, line):
+        if self.style == 'tiles':
+            self.log(line)
+        elif self.style == 'bar':
+            now = time.perf_counter()
+            if now - self.last_update < PROGRESS_INTERVAL and count < self.total:
+                return
+            self.last_update = now
+            filled = min(30, int(30 * count / self.total)) if self.total else 30
+            rate = count / (now - self.started) if now > self.started else 0
+            self.log(f"\r   [{'#' * filled}{'.' * (30 - filled)}] {count}/{self.total} ({rate:.1f} potongan/s)",
+                     end='', flush=True)
+    
+    def close(self):
+        if self.style == 'bar':
+            self.log()
+
+def _silent(*args, **kwargs):
+    """Pengganti print saat verbose=False"""
+
+def encode_settings(output_ext, profile=DEFAULT_ENCODE_PROFILE, load_plugin=True):
+    """Menentukan format Pillow dan opsi save untuk ekstensi output dan profil encoding.
+
+    load_plugin=False tidak memuat plugin encoder, sehingga untuk ekstensi
+    di IMAGE_FORMATS Pillow tidak diimpor (cek manifest incremental).
+    """
+    output_ext = output_ext.lower()
+    format_name = IMAGE_FORMATS.get(output_ext) or Image.registered_extensions().get(output_ext)
+    if format_name is None:
+        raise ValueError(f"Format output tidak didukung: {output_ext}")
+    if profile not in ENCODE_PROFILES:
+        raise ValueError(f"Profil encoding tidak dikenal: {profile} (pilih: {', '.join(ENCODE_PROFILES)})")
+    if load_plugin:
+        load_image_plugin(format_name)
+    return format_name, dict(ENCODE_PROFILES[profile].get(format_name, {}))
+
+def output_extension(image_ext, output_format=None):
+    """Ekstensi file potongan: sama dengan sumber, atau sesuai output_format (mis. 'webp')"""
+    if output_format is None:
+        return image_ext
+    return '.' + output_format.lower().lstrip('.')
+
+def timed_call(function, *args):
+    """Memanggil function(*args) dan mengembalikan (hasil, durasi detik).
+
+    Waktu diukur di worker dan dicatat ke metrik oleh pemanggil, sehingga
+    juga berlaku untuk worker di proses lain.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def open_encode_pool(workers, encode_pool=DEFAULT_ENCODE_POOL):
+    """Executor untuk encode paralel sesuai ENCODE_POOLS, atau None jika workers <= 1.
+
+    Pool proses memakai start method 'spawn' karena proses utama sudah
+    menjalankan thread (BackgroundWriter) yang tidak aman untuk fork.
+    """
+    if encode_pool not in ENCODE_POOLS:
+        raise ValueError(f"Pool encode tidak dikenal: {encode_pool} (pilih: {', '.join(ENCODE_POOLS)})")
+    if workers <= 1:
+        return None
+    if encode_pool == 'process':
+        return futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return futures.ThreadPoolExecutor(max_workers=workers)
+
+def encode_piece(piece, format_name, save_options):
+    """Meng-encode satu potongan menjadi bytes (dipanggil dari thread worker)"""
+    if format_name == 'JPEG' and piece.mode not in JPEG_MODES:
+        piece = piece.convert('RGB')
+    buffer = io.BytesIO()
+    piece.save(buffer, format=format_name, **save_options)
+    return buffer.getvalue()
+
+def _write_atomic(path, data):
+    """Menulis file lewat file sementara + rename, sehingga file tidak pernah setengah jadi"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp_path = path + PARTIAL_SUFFIX
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _sync_file(fd):
+    """fsync lalu lepas halaman file dari page cache (agar job besar tidak mengusir cache lain)"""
+    os.fsync(fd)
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+class DirectorySink:
+    """Menulis setiap potongan sebagai file terpisah di folder output gambar"""
+    
+    def __init__(self, image_output_dir, container_name, append=False):
+        self.location = image_output_dir
+        self.existing = set()
+        for name in os.listdir(image_output_dir):
+            if name.endswith(PARTIAL_SUFFIX):
+                # Sisa penulisan yang terhenti di tengah jalan
+                os.remove(os.path.join(image_output_dir, name))
+            else:
+                self.existing.add(name)
+        self.keeps_existing = True
+        self.unsynced = []
+    
+    def write(self, filename, row, col, size, data):
+        path = os.path.join(self.location, filename)
+        _write_atomic(path, data)
+        self.unsynced.append(path)
+    
+    def sync(self):
+        for path in self.unsynced:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                _sync_file(fd)
+            finally:
+                os.close(fd)
+        self.unsynced = []
+        try:
+            # Entri direktori juga harus tersimpan agar file baru tidak hilang setelah crash
+            fd = os.open(self.location, os.O_RDONLY)
+        except OSError:
+            return  # Windows tidak bisa membuka direktori
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def close(self):
+        pass
+
+class ZipSink:
+    """Menulis semua potongan ke satu file zip (tanpa kompresi ulang).
+
+    Direktori pusat zip menjadi indeks per nama file, dan anggota
+    'index.json' memetakan "baris,kolom" ke nama potongan.
+    """
+    
+    def __init__(self, image_output_dir, container_name, append=False):
+        self.location = os.path.join(image_output_dir, container_name + '.zip')
+        self.existing = set()
+        if os.path.exists(self.location):
+            try:
+                with zipfile.ZipFile(self.location) as zf:
+                    self.existing = set(zf.namelist())
+            except (OSError, zipfile.BadZipFile):
+                pass
+        # Zip selalu ditulis ulang, jadi potongan yang dilewati akan hilang
+        self.keeps_existing = False
+        self.grid = {}
+        self.zip = None
+    
+    def write(self, filename, row, col, size, data):
+        if self.zip is None:
+            self.zip = zipfile.ZipFile(self.location, 'w', zipfile.ZIP_STORED, allowZip64=True)
+        self.zip.writestr(filename, data)
+        self.grid[f"{row},{col}"] = filename
+    
+    def sync(self):
+        if self.zip is not None:
+            self.zip.fp.flush()
+            _sync_file(self.zip.fp.fileno())
+    
+    def close(self):
+        if self.zip is not None:
+            self.zip.writestr('index.json', json.dumps({'grid': self.grid}))
+            self.zip.close()
+
+def read_pack_index(pack_path):
+    """Membaca indeks file pack: mengembalikan (offset akhir data, indeks)"""
+    with open(pack_path, 'rb') as f:
+        f.seek(-PACK_FOOTER.size, os.SEEK_END)
+        index_offset, index_length, magic = PACK_FOOTER.unpack(f.read(PACK_FOOTER.size))
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Bukan file pack yang valid: {pack_path}")
+        f.seek(index_offset)
+        return index_offset, json.loads(f.read(index_length))
+
+def read_packed_tile(pack_path, row, col, frame=None):
+    """Membaca bytes satu potongan (baris/kolom/frame mulai dari 1) langsung dari offset-nya.
+
+    frame dipakai untuk pack hasil split_image_frames per halaman.
+    """
+    _, index = read_pack_index(pack_path)
+    key = f"{row},{col}" if frame is None else f"{frame}:{row},{col}"
+    entry = index['tiles'][index['grid'][key]]
+    with open(pack_path, 'rb') as f:
+        f.seek(entry['offset'])
+        return f.read(entry['length'])
+
+class PackSink:
+    """Menulis semua potongan berurutan ke satu file pack.
+
+    Layout: PACK_MAGIC, data potongan, indeks JSON (offset, panjang, baris,
+    kolom, ukuran per potongan), lalu PACK_FOOTER. Dengan append=True,
+    potongan baru ditulis setelah data lama dan indeks ditulis ulang.
+    """
+    
+    def __init__(self, image_output_dir, container_name, append=False):
+        self.location = os.path.join(image_output_dir, container_name + '.pack')
+        self.index = {'tiles': {}, 'grid': {}}
+        self.data_end = len(PACK_MAGIC)
+        if append and os.path.exists(self.location):
+            try:
+                self.data_end, self.index = read_pack_index(self.location)
+            except (OSError, ValueError, struct.error):
+                # Pack rusak: tulis ulang dari awal
+                pass
+        self.existing = set(self.index['tiles'])
+        self.keeps_existing = append
+        self.file = None
+    
+    def _open(self):
+        if self.existing:
+            self.file = open(self.location, 'r+b', buffering=CONTAINER_BUFFER_SIZE)
+            self.file.seek(self.data_end)
+            self.file.truncate()
+        else:
+            self.file = open(self.location, 'wb', buffering=CONTAINER_BUFFER_SIZE)
+            self.file.write(PACK_MAGIC)
+    
+    def write(self, filename, row, col, size, data):
+        if self.file is None:
+            self._open()
+        self.index['tiles'][filename] = {'offset': self.file.tell(), 'length': len(data),
+                                         'row': row, 'col': col, 'width': size[0], 'height': size[1]}
+        self.index['grid'][f"{row},{col}"] = filename
+        self.file.write(data)
+    
+    def sync(self):
+        if self.file is not None:
+            self.file.flush()
+            _sync_file(self.file.fileno())
+    
+    def close(self):
+        if self.file is None:
+            return
+        index_bytes = json.dumps(self.index).encode('utf-8')
+        index_offset = self.file.tell()
+        self.file.write(index_bytes)
+        self.file.write(PACK_FOOTER.pack(index_offset, len(index_bytes), PACK_MAGIC))
+        self.file.close()
+
+# Format output yang bisa menyimpan animasi (save_all) untuk potongan GIF/WebP/APNG animasi
+ANIMATED_FORMATS = ('GIF', 'WEBP', 'PNG')
+
+# Mode Pillow -> (dtype numpy, jumlah channel) untuk output .npy
+NATIVE_BYTE_ORDER = '<' if sys.byteorder == 'little' else '>'
+NPY_DTYPES = {
+    'L': ('|u1', 1), 'RGB': ('|u1', 3), 'RGBA': ('|u1', 4), 'CMYK': ('|u1', 4),
+    'I;16': ('<u2', 1), 'I': (NATIVE_BYTE_ORDER + 'i4', 1), 'F': (NATIVE_BYTE_ORDER + 'f4', 1),
+}
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+# Header .npy dibuat tetap 128 byte agar bisa ditulis ulang di tempat saat close
+NPY_HEADER_SIZE = 128
+
+def npy_mode(img):
+    """Mode Pillow yang dipakai untuk potongan .npy (mode lain dikonversi)"""
+    if img.mode in NPY_DTYPES:
+        return img.mode
+    if img.mode == '1':
+        return 'L'
+    return 'RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB'
+
+def piece_to_array_bytes(piece, mode):
+    """Pixel mentah satu potongan untuk NpySink (dipanggil dari thread worker)"""
+    if piece.mode != mode:
+        piece = piece.convert(mode)
+    return piece.tobytes()
+
+class NpySink:
+    """Menulis semua potongan sebagai satu array .npy (N, tinggi, lebar[, channel]).
+
+    Semua potongan harus berukuran sama (pakai pad_edges). Header ditulis
+    ulang saat close dengan jumlah potongan akhir, sehingga file bisa dibuka
+    langsung dengan numpy.load(..., mmap_mode='r') (lihat load_tile_array).
+    Nama, baris, dan kolom tiap potongan disimpan di '<nama>.npy.json'.
+    """
+    
+    def __init__(self, image_output_dir, container_name, append=False):
+        self.location = os.path.join(image_output_dir, container_name + '.npy')
+        self.index_path = self.location + '.json'
+        self.existing = set()
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.existing = {tile['name'] for tile in json.load(f)['tiles']}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        # Array selalu ditulis ulang, sama seperti zip
+        self.keeps_existing = False
+        self.dtype, self.channels = NPY_DTYPES['RGB']
+        self.tile_size = None
+        self.tiles = []
+        self.file = None
+    
+    def set_mode(self, mode):
+        self.dtype, self.channels = NPY_DTYPES[mode]
+    
+    def _header(self):
+        width, height = self.tile_size
+        shape = (len(self.tiles), height, width) + ((self.channels,) if self.channels > 1 else ())
+        header = repr({'descr': self.dtype, 'fortran_order': False, 'shape': shape}).encode('latin1')
+        header_length = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2
+        return NPY_MAGIC + struct.pack('<H', header_length) + header.ljust(header_length - 1) + b'\n'
+    
+    def write(self, filename, row, col, size, data):
+        if self.file is None:
+            self.tile_size = size
+            self.file = open(self.location, 'wb', buffering=CONTAINER_BUFFER_SIZE)
+            self.file.write(self._header())
+        elif size != self.tile_size:
+            raise ValueError(f"Output npy membutuhkan potongan berukuran sama, "
+                             f"{filename} berukuran {size[0]}x{size[1]}px (aktifkan pad_edges)")
+        self.file.write(data)
+        self.tiles.append({'name': filename, 'row': row, 'col': col})
+    
+    def sync(self):
+        if self.file is not None:
+            self.file.flush()
+            _sync_file(self.file.fileno())
+    
+    def close(self):
+        if self.file is None:
+            return
+        self.file.seek(0)
+        self.file.write(self._header())
+        self.file.close()
+        _write_atomic(self.index_path, json.dumps({'tiles': self.tiles}))
+
+class BackgroundWriter:
+    """Menulis potongan ke sink dari thread terpisah agar encode dan I/O disk berjalan bersamaan.
+
+    Antrean dibatasi max_queued potongan: jika disk lebih lambat dari encode,
+    write() menunggu (backpressure) sehingga memori tetap terkendali. Urutan
+    tulis sama dengan urutan write(). max_queued=0 menulis langsung tanpa
+    thread. sync_every=N memanggil sink.sync() setiap N potongan dan saat
+    close (fsync + lepas page cache). on_written(nama) dipanggil setelah
+    setiap potongan selesai ditulis. Error penulisan dilempar ulang di
+    write() berikutnya atau di close().
+    """
+    
+    def __init__(self, sink, metrics, max_queued=DEFAULT_WRITE_QUEUE, sync_every=None, on_written=None):
+        self.sink = sink
+        self.metrics = metrics
+        self.sync_every = sync_every
+        self.on_written = on_written
+        self.written = 0
+        self.error = None
+        self.thread = None
+        if max_queued:
+            self.queue = queue.Queue(maxsize=max_queued)
+            self.thread = threading.Thread(target=self._run, name='split-writer', daemon=True)
+            self.thread.start()
+    
+    def _write(self, item):
+        with self.metrics.stage('write'):
+            self.sink.write(*item)
+            self.written += 1
+            if self.sync_every and self.written % self.sync_every == 0:
+                self.sink.sync()
+        if self.on_written is not None:
+            self.on_written(item[0])
+    
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # Buang sisa antrean setelah error
+            try:
+                self._write(item)
+            except Exception as e:
+                self.error = e
+    
+    def write(self, filename, row, col, size, data):
+        if self.error is not None:
+            raise self.error
+        if self.thread is None:
+            self._write((filename, row, col, size, data))
+        else:
+            self.queue.put((filename, row, col, size, data))
+    
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        with self.metrics.stage('write'):
+            try:
+                if self.error is None and self.sync_every:
+                    self.sink.sync()
+            finally:
+                self.sink.close()
+        if self.error is not None:
+            raise self.error
+
+class JobJournal:
+    """Jurnal job (JSON lines) di folder output untuk melanjutkan job yang terhenti.
+
+    Baris pertama berisi parameter job, baris berikutnya event per gambar:
+    mulai (dengan ukuran/mtime sumber), potongan selesai, dan gambar selesai.
+    Potongan hanya dicatat setelah file-nya ditulis utuh (tulis ke file
+    sementara lalu rename), jadi saat resume potongan yang tercatat bisa
+    dilewati tanpa dicek ulang. Nama file jurnal diturunkan dari hash job
+    (lihat journal_job), jadi job lain di folder output yang sama memakai
+    jurnal sendiri. Dengan resume=True, jurnal lama dipakai jika parameter
+    job-nya sama; jika tidak, jurnal dimulai dari awal.
+    """
+    
+    def __init__(self, output_dir, job, resume=False):
+        # Normalisasi lewat JSON agar tuple dan list dianggap sama
+        self.job = json.loads(json.dumps(job))
+        job_key = hashlib.sha256(json.dumps(self.job, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME.format(job=job_key))
+        self.images = (self._load() if resume else None)
+        self.resumed = self.images is not None
+        if not self.resumed:
+            self.images = {}
+        self.lock = threading.Lock()
+        self.file = open(self.path, 'a' if self.resumed else 'w', encoding='utf-8')
+        if not self.resumed:
+            self._append({'job': self.job})
+    
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        try:
+            if not lines or json.loads(lines[0]).get('job') != self.job:
+                return None
+        except ValueError:
+            return None
+        
+        images = {}
+        for line in lines[1:]:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break  # Baris terakhir terpotong saat proses mati
+            if 'source' in event:
+                images[event['image']] = {'source': event['source'], 'tiles': set(), 'done': None}
+            elif event['image'] in images:
+                if 'tile' in event:
+                    images[event['image']]['tiles'].add(event['tile'])
+                elif 'done' in event:
+                    images[event['image']]['done'] = event['done']
+        return images
+    
+    def _append(self, event):
+        with self.lock:
+            self.file.write(json.dumps(event) + '\n')
+            self.file.flush()
+    
+    @staticmethod
+    def _source(image_path):
+        stat = os.stat(image_path)
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def completed(self, image_path):
+        """Hasil gambar yang sudah selesai di job sebelumnya, atau None"""
+        state = self.images.get(os.path.abspath(image_path))
+        if state and state['done'] and state['source'] == self._source(image_path):
+            return state['done']
+        return None
+    
+    def start_image(self, image_path):
+        key = os.path.abspath(image_path)
+        source = self._source(image_path)
+        state = self.images.get(key)
+        if state is None or state['source'] != source:
+            # Sumber baru atau berubah: potongan dari job sebelumnya tidak berlaku
+            self.images[key] = {'source': source, 'tiles': set(), 'done': None}
+            self._append({'image': key, 'source': source})
+    
+    def tiles_done(self, image_path):
+        """Nama potongan yang sudah selesai ditulis untuk gambar ini"""
+        state = self.images.get(os.path.abspath(image_path))
+        return frozenset(state['tiles']) if state else frozenset()
+    
+    def record_tile(self, image_path, filename):
+        self._append({'image': os.path.abspath(image_path), 'tile': filename})
+    
+    def finish_image(self, result):
+        done = {'tiles': result.tiles + result.skipped, 'location': result.location}
+        self.images[os.path.abspath(result.image_path)]['done'] = done
+        self._append({'image': os.path.abspath(result.image_path), 'done': done})
+    
+    def close(self, finished):
+        """Menutup jurnal; jurnal dihapus jika semua gambar selesai (tidak ada yang perlu dilanjutkan)"""
+        self.file.close()
+        if finished:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+def journal_job(mode, params, options, image_paths):
+    """Parameter job untuk JobJournal: gambar input dan opsi yang memengaruhi hasil potongan"""
+    runtime_options = ('verbose', 'progress', 'write_queue', 'sync_every', 'journal', 'encode_pool')
+    return {'mode': mode, 'params': list(params),
+            'inputs': [os.path.abspath(image_path) for image_path in image_paths],
+            'options': {key: value for key, value in sorted(options.items()) if key not in runtime_options}}
+
+def load_tile_array(npy_path, mmap=True):
+    """Membuka output .npy sebagai array numpy (tanpa menyalin jika mmap=True).
+
+    numpy hanya dibutuhkan untuk fungsi ini, bukan untuk menulis file .npy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("load_tile_array membutuhkan numpy (pip install numpy)") from None
+    return numpy.load(npy_path, mmap_mode='r' if mmap else None)
+
+# Tujuan penulisan potongan: file terpisah, zip, pack, atau array .npy
+OUTPUT_SINKS = {'dir': DirectorySink, 'zip': ZipSink, 'pack': PackSink, 'npy': NpySink}
+
+def open_sink(output_sink, image_output_dir, container_name, append=False):
+    """Membuat sink output sesuai nama ('dir', 'zip', 'pack', atau 'npy')"""
+    if output_sink not in OUTPUT_SINKS:
+        raise ValueError(f"Output sink tidak dikenal: {output_sink} (pilih: {', '.join(OUTPUT_SINKS)})")
+    return OUTPUT_SINKS[output_sink](image_output_dir, container_name, append=append)
+
+def _raw_tile_layout(img, tile):
+    """Mengembalikan (extents, offset, rawmode, stride, ystep) untuk tile 'raw', atau None"""
+    decoder_name, extents, offset, args = tuple(tile)
+    if decoder_name != 'raw':
+        return None
+    if isinstance(args, str):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    ystep = args[2] if len(args) > 2 else 1
+    if not stride:
+        # Stride 0 berarti baris rapat: hitung panjang satu baris dalam rawmode
+        tile_width = extents[2] - extents[0]
+        stride = len(Image.new(img.mode, (tile_width, 1)).tobytes('raw', rawmode))
+    return extents, offset, rawmode, stride, ystep
+
+def can_read_bands(img):
+    """Cek apakah gambar bisa dibaca per band tanpa decode penuh.
+
+    Hanya berlaku untuk data tanpa kompresi (TIFF strip/tile tanpa kompresi,
+    BMP, PPM) karena offset setiap scanline bisa dihitung langsung.
+    """
+    if img.mode == 'P' or not img.tile:
+        return False
+    try:
+        return all(_raw_tile_layout(img, tile) is not None for tile in img.tile)
+    except Exception:
+        return False
+
+def read_band(img, top, bottom):
+    """Membaca baris [top, bottom) dari gambar yang belum di-load.
+
+    Hanya scanline yang dibutuhkan yang dibaca dari file, sehingga memori
+    sebanding dengan tinggi band, bukan tinggi gambar.
+    """
+    band = Image.new(img.mode, (img.width, bottom - top))
+    for tile in img.tile:
+        (x0, y0, x1, y1), offset, rawmode, stride, ystep = _raw_tile_layout(img, tile)
+        first = max(top, y0) - y0
+        last = min(bottom, y1) - y0
+        if first >= last:
+            continue
+        
+        # Baris file berurutan dari atas (ystep 1) atau dari bawah (ystep -1, mis. BMP)
+        file_row = first if ystep > 0 else (y1 - y0) - last
+        img.fp.seek(offset + file_row * stride)
+        data = img.fp.read((last - first) * stride)
+        
+        part = Image.frombytes(img.mode, (x1 - x0, last - first), data, 'raw', rawmode, stride, ystep)
+        band.paste(part, (x0, y0 + first - top))
+    return band
+
+# Mode Pillow yang layout memorinya sama dengan data mentah di file,
+# sehingga Image.frombuffer bisa memakai buffer mmap tanpa menyalin
+MAPPABLE_MODES = ('L', 'RGBA', 'RGBX', 'CMYK', 'I;16', 'I;16L', 'I;16B', 'F', 'I')
+
+def open_mapped(image_path, img):
+    """Memetakan data pixel tanpa kompresi langsung dari file dengan mmap.
+
+    Mengembalikan Image yang pixel-nya adalah halaman file yang di-mmap
+    (tanpa salinan), atau None jika layout file tidak mendukung. Crop dari
+    gambar ini hanya menyalin area potongan yang kemudian di-encode.
+    """
+    if img.mode not in MAPPABLE_MODES or not can_read_bands(img):
+        return None
+    
+    layouts = sorted((_raw_tile_layout(img, tile) for tile in img.tile), key=lambda layout: layout[0][1])
+    (_, _, _, _), base_offset, rawmode, stride, ystep = layouts[0]
+    if rawmode != img.mode or ystep != 1:
+        return None
+    
+    # Semua strip harus selebar gambar dan berurutan tanpa celah di file
+    for (x0, y0, x1, y1), offset, tile_rawmode, tile_stride, tile_ystep in layouts:
+        if (x0, x1) != (0, img.width) or tile_rawmode != rawmode or tile_stride != stride or \
+                tile_ystep != 1 or offset != base_offset + y0 * stride:
+            return None
+    
+    with open(image_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if base_offset + img.height * stride > len(mapped):
+        mapped.close()
+        return None
+    
+    view = memoryview(mapped)[base_offset:base_offset + img.height * stride]
+    return Image.frombuffer(img.mode, img.size, view, 'raw', rawmode, stride, 1)
+
+def jpeg_mcu_size(img):
+    """Ukuran MCU JPEG (lebar, tinggi) dalam pixel, atau None jika bukan JPEG"""
+    layers = getattr(img, 'layer', None)
+    if img.format != 'JPEG' or not layers:
+        return None
+    # Setiap layer: (id, faktor sampling horizontal, faktor sampling vertikal, tabel kuantisasi)
+    return 8 * max(layer[1] for layer in layers), 8 * max(layer[2] for layer in layers)
+
+def crop_jpeg_lossless(source, box, optimize=True):
+    """Memotong JPEG di domain DCT dengan jpegtran (tanpa kehilangan kualitas).
+
+    source berupa path file atau bytes JPEG (dikirim lewat stdin). Sudut
+    kiri atas box harus tepat di batas MCU; kanan/bawah boleh bebas.
+    jpegtran membaca koefisien seluruh sumber di setiap pemanggilan, jadi
+    untuk banyak potongan potong dulu satu band baris dari file, lalu
+    potongan dari band tersebut. Mengembalikan bytes JPEG potongan.
+    """
+    left, top, right, bottom = box
+    args = [jpegtran_path(), '-copy', 'none'] + (['-optimize'] if optimize else []) + \
+        ['-crop', f"{right - left}x{bottom - top}+{left}+{top}"]
+    if isinstance(source, bytes):
+        result = subprocess.run(args, input=source, check=True, capture_output=True)
+    else:
+        result = subprocess.run(args + [source], check=True, capture_output=True)
+    return result.stdout
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Menghitung hash SHA-256 isi file secara bertahap"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def tile_digest(piece):
+    """Menghitung hash isi pixel sebuah potongan"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{piece.mode}:{piece.width}x{piece.height}:".encode())
+    digest.update(piece.tobytes())
+    return digest.hexdigest()
+
+def blank_tile_key(piece, tolerance):
+    """Kunci pengelompokan potongan seragam, atau None jika potongan tidak seragam.
+
+    Potongan dianggap seragam jika selisih nilai min/max tiap band tidak
+    lebih dari tolerance. getextrema() berjalan di C tanpa menyalin pixel.
+    """
+    extrema = piece.getextrema()
+    if not isinstance(extrema[0], tuple):
+        extrema = (extrema,)
+    if any(high - low > tolerance for low, high in extrema):
+        return None
+    # Potongan seragam dengan ukuran dan warna tengah yang sama memakai satu pengganti
+    return ('blank', piece.mode, piece.size, tuple(low + (high - low) // 2 for low, high in extrema))
+
+def load_tile_map(image_output_dir, mode):
+    """Membaca peta potongan pengganti: {nama potongan: {'tile', 'row', 'col'}}.
+
+    Potongan yang dilewati karena kosong/duplikat tidak ditulis; isinya sama
+    dengan potongan 'tile' (baris/kolom untuk read_packed_tile). Mengembalikan
+    dict kosong jika tidak ada.
+    """
+    try:
+        with open(os.path.join(image_output_dir, TILE_MAP_FILENAME.format(mode=mode)), encoding='utf-8') as f:
+            return json.load(f)['tiles']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def save_tile_map(image_output_dir, mode, tiles, settings):
+    """Menyimpan peta potongan pengganti secara atomik"""
+    _write_atomic(os.path.join(image_output_dir, TILE_MAP_FILENAME.format(mode=mode)),
+                  json.dumps(dict(settings, tiles=tiles), indent=1, sort_keys=True))
+
+def discard_tile_map(image_output_dir, mode):
+    """Menghapus peta potongan pengganti dari run sebelumnya"""
+    try:
+        os.remove(os.path.join(image_output_dir, TILE_MAP_FILENAME.format(mode=mode)))
+    except FileNotFoundError:
+        pass
+
+def load_manifest(image_output_dir, mode):
+    """Membaca manifest incremental, atau None jika belum ada/rusak"""
+    try:
+        with open(os.path.join(image_output_dir, MANIFEST_FILENAME.format(mode=mode)), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(image_output_dir, mode, manifest):
+    """Menyimpan manifest incremental secara atomik (tulis ke file sementara lalu rename)"""
+    manifest_path = os.path.join(image_output_dir, MANIFEST_FILENAME.format(mode=mode))
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def discard_manifest(image_output_dir, mode):
+    """Menghapus manifest incremental (dipanggil saat potongan ditulis ulang tanpa manifest)"""
     try:
+        os.remove(os.path.join(image_output_dir, MANIFEST_FILENAME.format(mode=mode)))
+    except FileNotFoundError:
+        pass
+
+def source_fingerprint(image_path, manifest):
+    """Sidik jari file sumber.
+
+    Hash isi file hanya dihitung ulang jika ukuran atau mtime berubah
+    dibanding manifest, sehingga rerun pada file yang sama tidak membaca ulang.
+    """
+    stat = os.stat(image_path)
+    if manifest and manifest.get('source_size') == stat.st_size and \
+            manifest.get('source_mtime') == stat.st_mtime_ns and manifest.get('source_hash'):
+        source_hash = manifest['source_hash']
+    else:
+        source_hash = file_digest(image_path)
+    return {'source_hash': source_hash, 'source_size': stat.st_size, 'source_mtime': stat.st_mtime_ns}
+
+def manifest_is_current(manifest, fingerprint, params, sink):
+    """Cek apakah hasil sebelumnya masih valid untuk sumber dan parameter ini"""
+    return (manifest is not None
+            and manifest.get('source_hash') == fingerprint['source_hash']
+            and manifest.get('params') == params
+            and all(name in sink.existing for name in manifest.get('tiles', {})))
+
+def decode_scaled(img, scale):
+    """Decode gambar pada resolusi terkecil yang masih >= scale x ukuran asli.
+
+    JPEG memakai draft() sehingga libjpeg men-decode langsung di skala DCT
+    1/2, 1/4, atau 1/8 (waktu dan memori decode turun 4-64x). Format lain
+    di-decode penuh lalu diperkecil dengan reduce() berfaktor bulat.
+    """
+    needed = (max(1, math.ceil(img.width * scale)), max(1, math.ceil(img.height * scale)))
+    img.draft(img.mode, needed)
+    img.load()
+    factor = min(img.width // needed[0], img.height // needed[1])
+    if factor > 1:
+        return img.reduce(factor)
+    return img
+
+def crop_scaled(decoded, box, source_size, scale):
+    """Crop kotak (koordinat gambar asli) dari hasil decode_scaled lalu ubah ke ukuran akhir.
+
+    scale berupa (skala x, skala y), jadi potongan penuh tepat sebesar
+    output_size meskipun rasionya berbeda dengan potongan sumber.
+    """
+    left, top, right, bottom = box
+    fx = decoded.width / source_size[0]
+    fy = decoded.height / source_size[1]
+    piece = decoded.crop((round(left * fx), round(top * fy), round(right * fx), round(bottom * fy)))
+    size = (max(1, round((right - left) * scale[0])), max(1, round((bottom - top) * scale[1])))
+    if piece.size != size:
+        piece = piece.resize(size, Image.LANCZOS)
+    return piece
+
+def tile_starts(length, tile_size, stride):
+    """Posisi awal potongan sepanjang satu sumbu; potongan terakhir menyentuh tepi gambar"""
+    if length <= tile_size:
+        return [0]
+    return [i * stride for i in range(math.ceil((length - tile_size) / stride) + 1)]
+
+def split_image_by_pixel(image_path, output_dir, split_width, split_height, workers=1, streaming=False,
+                         memory_map=False, incremental=False, lossless_jpeg=False,
+                         encode_profile=DEFAULT_ENCODE_PROFILE, output_format=None, output_sink='dir',
+                         skip_blank=None, dedupe=False, overlap=0, pad_edges=False,
+                         write_queue=DEFAULT_WRITE_QUEUE, sync_every=None, journal=None, output_size=None,
+                         encode_pool=DEFAULT_ENCODE_POOL, reserve_memory=None, verbose=True, progress='tiles'):
+    """Memotong gambar berdasarkan dimensi pixel yang ditentukan.
+
+    Jika workers > 1, encoding potongan dijalankan paralel di pool
+    encode_pool (lihat ENCODE_POOLS). Gambar sumber hanya di-decode sekali;
+    pool thread memakainya bersama tanpa menyalin, pool proses menerima
+    setiap potongan sebagai bytes.
+
+    Jika streaming=True dan format mendukung (lihat can_read_bands), gambar
+    dibaca satu baris potongan sekali jalan sehingga memori puncak sekitar
+    satu baris potongan. Format terkompresi tetap di-decode penuh.
+
+    Jika memory_map=True dan file bisa dipetakan (lihat open_mapped), potongan
+    di-crop langsung dari file yang di-mmap tanpa decode.
+
+    Jika incremental=True, manifest di folder output dipakai untuk melewati
+    gambar yang sumber dan parameternya tidak berubah, serta potongan yang
+    isi pixel-nya sama dengan run sebelumnya.
+
+    Jika lossless_jpeg=True, sumber JPEG, jpegtran tersedia, dan dimensi
+    potongan kelipatan ukuran MCU, potongan diambil langsung dari koefisien
+    DCT tanpa decode/re-encode (kualitas identik dengan sumber). File
+    sumber hanya dibaca jpegtran sekali per baris potongan (lihat
+    crop_jpeg_lossless).
+
+    encode_profile memilih trade-off kecepatan/ukuran ('fast', 'balanced',
+    'smallest'), dan output_format (mis. 'webp') mengganti format potongan.
+
+    output_sink menentukan tujuan potongan: 'dir' (file terpisah), 'zip',
+    atau 'pack' (satu file dengan indeks baris/kolom, lihat PackSink), atau
+    'npy' (satu array pixel mentah untuk inferensi, lihat NpySink).
+
+    overlap membuat potongan bertumpuk sebanyak overlap pixel (langkah =
+    ukuran potongan - overlap). pad_edges=True mengisi potongan di tepi
+    dengan pixel 0 sampai ukuran penuh; selalu aktif untuk output 'npy'.
+
+    Potongan ditulis oleh BackgroundWriter dengan antrean write_queue
+    potongan, sehingga encode berikutnya berjalan selama disk menulis.
+    sync_every=N melakukan fsync setiap N potongan (lihat BackgroundWriter).
+    Dengan journal (JobJournal) dan output 'dir', setiap potongan yang
+    selesai dicatat, dan potongan yang tercatat di job sebelumnya dilewati.
+
+    output_size=(lebar, tinggi) mengubah setiap potongan split_width x
+    split_height tepat ke ukuran tersebut (mis. thumbnail; rasio potongan
+    ikut berubah jika berbeda), potongan tepi diskalakan dengan faktor yang
+    sama. Gambar di-decode pada
+    resolusi terkecil yang cukup (lihat decode_scaled), jadi streaming, mmap,
+    dan JPEG lossless tidak dipakai.
+
+    skip_blank=N melewati encode potongan seragam (selisih pixel <= N per
+    band) kecuali yang pertama per warna, dan dedupe=True melewati potongan
+    yang identik dengan potongan yang sudah ditulis. Potongan yang dilewati
+    dicatat di peta potongan (lihat load_tile_map). Tidak berlaku untuk
+    mode JPEG lossless karena pixel tidak di-decode.
+
+    reserve_memory(byte) dipanggil dengan perkiraan memori decode setelah
+    cek incremental dan sebelum decode (lihat split_images_batch).
+
+    verbose=False mematikan output ke console, dan progress memilih tampilan
+    progress ('tiles', 'bar', 'none', lihat ProgressReporter). Mengembalikan
+    SplitResult dengan metrik waktu per tahap (lihat SplitMetrics).
+    """
+    log = print if verbose else _silent
+    metrics = SplitMetrics()
+    try:
+        if not 0 <= overlap < min(split_width, split_height):
+            raise ValueError(f"Overlap {overlap}px harus antara 0 dan ukuran potongan")
+        raw_output = output_sink == 'npy'
+        pad_edges = pad_edges or raw_output
+        
+        image_name = os.path.splitext(os.path.basename(image_path))[0]
+        image_ext = output_extension(os.path.splitext(os.path.basename(image_path))[1], output_format)
+        # Format dari ekstensi saja: rerun tanpa perubahan tidak mengimpor Pillow atau membuka sumber
+        format_name, save_options = encode_settings(image_ext, encode_profile, load_plugin=False)
+        
+        log(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
+        
+        # Buat folder output untuk gambar ini
+        image_output_dir = os.path.join(output_dir, image_name)
+        os.makedirs(image_output_dir, exist_ok=True)
+        
+        sink = open_sink(output_sink, image_output_dir, f"{image_name}_pixel", append=incremental)
+        if not incremental:
+            # Potongan lama akan ditimpa, manifest lama tidak lagi valid
+            discard_manifest(image_output_dir, 'pixel')
+        else:
+            params = {'mode': 'pixel', 'width': split_width, 'height': split_height,
+                      'ext': image_ext, 'save_options': save_options, 'sink': output_sink}
+            if skip_blank is not None or dedupe:
+                params.update(skip_blank=skip_blank, dedupe=dedupe)
+            if overlap or pad_edges:
+                params.update(overlap=overlap, pad_edges=pad_edges)
+            if output_size:
+                params['output_size'] = list(output_size)
+            if lossless_jpeg:
+                params['lossless_jpeg'] = True
+            manifest = load_manifest(image_output_dir, params['mode'])
+            fingerprint = source_fingerprint(image_path, manifest)
+            if manifest_is_current(manifest, fingerprint, params, sink):
+                log(f"   ⏭️  Tidak ada perubahan, dilewati: {sink.location}")
+                return SplitResult(image_path, True, skipped=len(manifest.get('tiles', {})),
+                                   location=sink.location, metrics=metrics.as_dict(0))
+            old_tiles = manifest.get('tiles', {}) if manifest and manifest.get('params') == params else {}
+            new_tiles = {}
+        
         # Buka gambar
-        with Image.open(image_path) as img:
+        with open_image(image_path) as img:
+            load_image_plugin(format_name)
+            if reserve_memory is not None:
+                reserve_memory(decoded_size(img))
             img_width, img_height = img.size
-            image_name = os.path.splitext(os.path.basename(image_path))[0]
-            image_ext = os.path.splitext(os.path.basename(image_path))[1]
-            
-            print(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
-            print(f"   Ukuran asli: {img_width}x{img_height}px")
+            log(f"   Ukuran asli: {img_width}x{img_height}px")
             
             # Hitung jumlah potongan
-            cols = math.ceil(img_width / split_width)
-            rows = math.ceil(img_height / split_height)
+            col_starts = tile_starts(img_width, split_width, split_width - overlap)
+            row_starts = tile_starts(img_height, split_height, split_height - overlap)
+            cols = len(col_starts)
+            rows = len(row_starts)
             total_pieces = cols * rows
             
-            print(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris = {total_pieces} potongan")
-            
-            # Buat folder output untuk gambar ini
-            image_output_dir = os.path.join(output_dir, image_name)
-            os.makedirs(image_output_dir, exist_ok=True)
+            log(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris = {total_pieces} potongan")
+            if overlap:
+                log(f"   Overlap: {overlap}px (langkah {split_width - overlap}x{split_height - overlap}px)")
             
             piece_count = 0
+            skipped_count = 0
             
-            # Potong gambar
-            for row in range(rows):
-                for col in range(cols):
-                    # Hitung koordinat crop
-                    left = col * split_width
-                    top = row * split_height
-                    right = min(left + split_width, img_width)
+            # Skala potongan akhir terhadap potongan di gambar asli
+            scale = (output_size[0] / split_width, output_size[1] / split_height) if output_size else None
+            
+            lossless = False
+            # jpegtran tidak bisa menambah padding/mengubah ukuran, dan output npy butuh pixel mentah
+            if lossless_jpeg and jpegtran_path() and format_name == 'JPEG' and not pad_edges and scale is None:
+                mcu_size = jpeg_mcu_size(img)
+                lossless = mcu_size is not None and \
+                    split_width % mcu_size[0] == 0 and split_height % mcu_size[1] == 0 and \
+                    overlap % mcu_size[0] == 0 and overlap % mcu_size[1] == 0
+                if mcu_size is not None and not lossless:
+                    log(f"   ⚠️  Dimensi potongan bukan kelipatan MCU {mcu_size[0]}x{mcu_size[1]}, "
+                        f"memakai re-encode")
+            
+            mapped = open_mapped(image_path, img) if memory_map and not lossless and scale is None else None
+            streaming = mapped is None and streaming and scale is None and can_read_bands(img)
+            decoded = img
+            # Peta potongan lama tidak berlaku lagi kecuali ditulis ulang di bawah
+            discard_tile_map(image_output_dir, 'pixel')
+            detect_blank = skip_blank is not None and not lossless
+            detect_duplicates = dedupe and not lossless
+            # Kunci isi potongan -> (nama, baris, kolom) potongan yang mewakilinya
+            seen_tiles = {}
+            tile_map = {}
+            
+            if lossless:
+                log("   Mode JPEG lossless: memotong di domain DCT dengan jpegtran")
+            elif mapped is not None:
+                log("   Mode mmap: memotong langsung dari file")
+            elif streaming:
+                log("   Mode streaming: membaca per baris potongan")
+            elif scale is not None and max(scale) < 1:
+                with metrics.stage('decode'):
+                    # Resolusi decode harus cukup untuk sumbu yang paling sedikit diperkecil
+                    decoded = decode_scaled(img, max(scale))
+                log(f"   Decode resolusi rendah: {decoded.width}x{decoded.height}px untuk potongan "
+                    f"{output_size[0]}x{output_size[1]}px")
+            else:
+                # Decode sekali di sini agar semua worker memakai buffer yang sama
+                with metrics.stage('decode'):
+                    img.load()
+            if raw_output:
+                array_mode = npy_mode(img)
+                sink.set_mode(array_mode)
+            executor = open_encode_pool(workers, encode_pool)
+            # Batasi jumlah potongan yang menunggu encode agar memori tetap terkendali
+            pending = deque()
+            max_pending = workers * 2
+            reporter = ProgressReporter(total_pieces, progress, log)
+            # Hanya file terpisah yang utuh per potongan; container baru valid setelah close
+            resumable = journal is not None and output_sink == 'dir'
+            resumed_tiles = journal.tiles_done(image_path) if resumable else frozenset()
+            on_written = (lambda filename: journal.record_tile(image_path, filename)) if resumable else None
+            writer = BackgroundWriter(sink, metrics, write_queue, sync_every, on_written)
+            
+            def finish_piece(future, piece_filename, row, col, piece_size):
+                nonlocal piece_count
+                # Potongan diserahkan ke writer sesuai urutan potongan
+                data, seconds = future.result() if isinstance(future, futures.Future) else future
+                metrics.add('encode', seconds)
+                writer.write(piece_filename, row + 1, col + 1, piece_size, data)
+                metrics.add_bytes(len(data))
+                piece_count += 1
+                reporter.update(piece_count, f"   ✅ Potongan {piece_count}/{total_pieces}: {piece_filename} "
+                                             f"({piece_size[0]}x{piece_size[1]}px)")
+            
+            try:
+                # Potong gambar
+                for row, top in enumerate(row_starts):
                     bottom = min(top + split_height, img_height)
+                    if lossless:
+                        # Band baris dipotong saat pertama dibutuhkan (baris yang sudah selesai dilewati)
+                        source, y_offset = None, top
+                    elif mapped is not None:
+                        source, y_offset = mapped, 0
+                    elif streaming:
+                        with metrics.stage('decode'):
+                            source, y_offset = read_band(img, top, bottom), top
+                    else:
+                        source, y_offset = decoded, 0
                     
-                    # Crop gambar
-                    piece = img.crop((left, top, right, bottom))
-                    
-                    # Nama file potongan
-                    piece_filename = f"{image_name}_row{row+1:02d}_col{col+1:02d}{image_ext}"
-                    piece_path = os.path.join(image_output_dir, piece_filename)
+                    for col, left in enumerate(col_starts):
+                        # Hitung koordinat crop
+                        right = min(left + split_width, img_width)
+                        
+                        # Nama file potongan
+                        piece_filename = f"{image_name}_row{row+1:02d}_col{col+1:02d}{image_ext}"
+                        
+                        if lossless:
+                            # Tanpa decode: tidak ada hash pixel per potongan
+                            if incremental:
+                                new_tiles[piece_filename] = None
+                            if piece_filename in resumed_tiles:
+                                skipped_count += 1
+                                continue
+                            if source is None:
+                                with metrics.stage('decode'):
+                                    source = crop_jpeg_lossless(image_path, (0, top, img_width, bottom),
+                                                                optimize=False)
+                            task = (crop_jpeg_lossless, source, (left, 0, right, bottom - y_offset))
+                            piece_size = (right - left, bottom - top)
+                        else:
+                            # Crop gambar (crop di luar batas gambar otomatis diisi pixel 0)
+                            crop_right, crop_bottom = (left + split_width, top + split_height) if pad_edges \
+                                else (right, bottom)
+                            with metrics.stage('crop'):
+                                if scale is None:
+                                    piece = source.crop((left, top - y_offset, crop_right, crop_bottom - y_offset))
+                                else:
+                                    piece = crop_scaled(decoded, (left, top, crop_right, crop_bottom),
+                                                        (img_width, img_height), scale)
+                            
+                            digest = tile_digest(piece) if incremental or detect_duplicates else None
+                            
+                            # Lewati potongan kosong/duplikat, cukup tunjuk potongan yang sudah ada
+                            if detect_blank or detect_duplicates:
+                                key = blank_tile_key(piece, skip_blank) if detect_blank else None
+                                if key is None and detect_duplicates:
+                                    key = digest
+                                if key is not None:
+                                    if key in seen_tiles:
+                                        target, target_row, target_col = seen_tiles[key]
+                                        tile_map[piece_filename] = {'tile': target, 'row': target_row,
+                                                                    'col': target_col}
+                                        continue
+                                    seen_tiles[key] = (piece_filename, row + 1, col + 1)
+                            
+                            # Potongan yang sudah ditulis sebelum job terhenti
+                            if piece_filename in resumed_tiles:
+                                if incremental:
+                                    new_tiles[piece_filename] = digest
+                                skipped_count += 1
+                                continue
+                            
+                            # Lewati potongan yang isinya sama dengan run sebelumnya
+                            if incremental:
+                                new_tiles[piece_filename] = digest
+                                if old_tiles.get(piece_filename) == new_tiles[piece_filename] and \
+                                        sink.keeps_existing and piece_filename in sink.existing:
+                                    skipped_count += 1
+                                    continue
+                            if raw_output:
+                                task = (piece_to_array_bytes, piece, array_mode)
+                            else:
+                                task = (encode_piece, piece, format_name, save_options)
+                            piece_size = piece.size
+                        
+                        # Simpan potongan
+                        if executor is None:
+                            finish_piece(timed_call(*task), piece_filename, row, col, piece_size)
+                            continue
+                        
+                        pending.append((executor.submit(timed_call, *task), piece_filename, row, col, piece_size))
+                        if len(pending) >= max_pending:
+                            finish_piece(*pending.popleft())
+                
+                while pending:
+                    finish_piece(*pending.popleft())
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                writer.close()
+                reporter.close()
+            
+            if detect_blank or detect_duplicates:
+                save_tile_map(image_output_dir, 'pixel', tile_map,
+                              {'skip_blank': skip_blank if detect_blank else None, 'dedupe': detect_duplicates})
+                if tile_map:
+                    log(f"   ♻️  {len(tile_map)} potongan kosong/duplikat tidak ditulis "
+                        f"(lihat {TILE_MAP_FILENAME.format(mode='pixel')})")
+            
+            if incremental:
+                save_manifest(image_output_dir, params['mode'], dict(fingerprint, params=params, tiles=new_tiles))
+                if skipped_count:
+                    log(f"   ⏭️  {skipped_count} potongan tidak berubah, dilewati")
+            
+            log(f"   🎉 Selesai! {piece_count} potongan disimpan di: {sink.location}")
+            return SplitResult(image_path, True, tiles=piece_count, skipped=skipped_count + len(tile_map),
+                               location=sink.location,
+                               metrics=metrics.as_dict(piece_count))
+            
+    except Exception as e:
+        log(f"   ❌ Error memproses gambar: {str(e)}")
+        return SplitResult(image_path, False, error=str(e), metrics=metrics.as_dict(0))
+
+# Rencana potongan mode rasio; boxes berisi (baris, kolom, kiri, atas, kanan, bawah)
+RatioPlan = namedtuple('RatioPlan', 'piece_width piece_height cols rows boxes')
+
+def _ratio_starts(length, tile, leftover):
+    """Posisi awal potongan sepanjang satu sumbu sesuai cara menangani sisa"""
+    if leftover == 'crop':
+        count = max(1, length // tile)
+    else:
+        count = max(1, math.ceil(length / tile))
+    if leftover == 'distribute' and count > 1:
+        # Potongan pertama dan terakhir menyentuh tepi, sisa dibagi rata sebagai overlap
+        return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+    # crop: sisa dibuang sama rata di kedua sisi; pad: padding dibagi di kedua sisi
+    offset = (length - count * tile) // 2
+    return [offset + i * tile for i in range(count)]
+
+@lru_cache(maxsize=256)
+def plan_ratio_tiles(img_width, img_height, ratio_w, ratio_h, target_width=None, leftover=DEFAULT_RATIO_LEFTOVER,
+                     max_tiles=None):
+    """Menghitung grid 2D potongan dengan rasio ratio_w:ratio_h.
+
+    Tanpa target_width, potongan dibuat sebesar mungkin di dalam gambar;
+    dengan target_width, potongan selebar target_width pixel. Sisa gambar
+    ditangani sesuai leftover: 'crop' (dibuang sama rata di kedua sisi),
+    'pad' (potongan tepi diisi pixel 0), atau 'distribute' (potongan
+    sedikit bertumpuk agar seluruh gambar tercakup tanpa padding).
+    max_tiles membatasi jumlah potongan dengan memperbesar potongan.
+
+    Hasil di-cache per dimensi, jadi batch gambar berukuran sama memakai
+    rencana yang sama tanpa menghitung ulang. Mengembalikan RatioPlan.
+    """
+    if leftover not in RATIO_LEFTOVERS:
+        raise ValueError(f"Cara menangani sisa tidak dikenal: {leftover} (pilih: {', '.join(RATIO_LEFTOVERS)})")
+    target_ratio = ratio_w / ratio_h
+    
+    def tile_size(width):
+        return width, max(1, round(width / target_ratio))
+    
+    def grid(width):
+        piece_width, piece_height = tile_size(width)
+        return (_ratio_starts(img_width, piece_width, leftover),
+                _ratio_starts(img_height, piece_height, leftover))
+    
+    # Potongan terbesar yang muat di dalam gambar
+    largest = max(1, min(img_width, math.floor(img_height * target_ratio)))
+    width = target_width or largest
+    if leftover != 'pad':
+        # Tanpa padding, potongan tidak boleh lebih besar dari gambar
+        width = min(width, largest)
+    
+    col_starts, row_starts = grid(width)
+    if max_tiles and len(col_starts) * len(row_starts) > max_tiles:
+        # Jumlah potongan turun monoton terhadap lebar potongan: cari lebar terkecil yang muat
+        low = width
+        high = max(img_width, math.ceil(img_height * target_ratio)) if leftover == 'pad' else largest
+        col_starts, row_starts = grid(high)
+        if len(col_starts) * len(row_starts) > max_tiles:
+            raise ValueError(f"Gambar {img_width}x{img_height}px tidak bisa dipotong menjadi maksimal "
+                             f"{max_tiles} potongan {ratio_w}:{ratio_h} tanpa padding (pakai leftover='pad')")
+        while low < high:
+            middle = (low + high) // 2
+            col_starts, row_starts = grid(middle)
+            if len(col_starts) * len(row_starts) > max_tiles:
+                low = middle + 1
+            else:
+                high = middle
+        width = low
+        col_starts, row_starts = grid(width)
+    
+    piece_width, piece_height = tile_size(width)
+    boxes = tuple((row, col, left, top, left + piece_width, top + piece_height)
+                  for row, top in enumerate(row_starts) for col, left in enumerate(col_starts))
+    return RatioPlan(piece_width, piece_height, len(col_starts), len(row_starts), boxes)
+
+def save_ratio_plan(image_output_dir, plan, img_size, params):
+    """Menyimpan rencana potongan mode rasio (kotak crop per potongan) untuk proses hilir"""
+    _write_atomic(os.path.join(image_output_dir, RATIO_PLAN_FILENAME),
+                  json.dumps(dict(plan._asdict(), image_size=img_size, params=params)))
+
+def split_image_by_ratio(image_path, output_dir, ratio_w, ratio_h, streaming=False, memory_map=False,
+                         incremental=False, encode_profile=DEFAULT_ENCODE_PROFILE, output_format=None,
+                         output_sink='dir', target_width=None, leftover=DEFAULT_RATIO_LEFTOVER, max_tiles=None,
+                         write_queue=DEFAULT_WRITE_QUEUE, sync_every=None, journal=None, reserve_memory=None,
+                         verbose=True, progress='tiles'):
+    """Memotong gambar berdasarkan rasio yang ditentukan.
+
+    Grid potongan dihitung oleh plan_ratio_tiles (target_width, leftover,
+    max_tiles) dan disimpan di folder output sebagai RATIO_PLAN_FILENAME.
+
+    streaming=True membaca gambar per baris potongan, memory_map=True
+    memotong langsung dari file yang di-mmap, incremental=True melewati
+    hasil yang tidak berubah, encode_profile/output_format mengatur
+    encoding potongan, output_sink memilih tujuan tulis, write_queue dan
+    sync_every mengatur BackgroundWriter, journal mencatat potongan untuk
+    resume, reserve_memory memesan memori decode, dan progress memilih
+    tampilan progress (lihat split_image_by_pixel).
+    """
+    log = print if verbose else _silent
+    metrics = SplitMetrics()
+    try:
+        if output_sink == 'npy':
+            raise ValueError("Output npy hanya tersedia untuk mode pixel")
+        
+        image_name = os.path.splitext(os.path.basename(image_path))[0]
+        image_ext = output_extension(os.path.splitext(os.path.basename(image_path))[1], output_format)
+        # Format dari ekstensi saja: rerun tanpa perubahan tidak mengimpor Pillow atau membuka sumber
+        format_name, save_options = encode_settings(image_ext, encode_profile, load_plugin=False)
+        
+        log(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
+        
+        # Buat folder output untuk gambar ini
+        image_output_dir = os.path.join(output_dir, image_name)
+        os.makedirs(image_output_dir, exist_ok=True)
+        
+        sink = open_sink(output_sink, image_output_dir, f"{image_name}_ratio", append=incremental)
+        if not incremental:
+            # Potongan lama akan ditimpa, manifest lama tidak lagi valid
+            discard_manifest(image_output_dir, 'ratio')
+        else:
+            params = {'mode': 'ratio', 'ratio_w': ratio_w, 'ratio_h': ratio_h,
+                      'ext': image_ext, 'save_options': save_options, 'sink': output_sink,
+                      'target_width': target_width, 'leftover': leftover, 'max_tiles': max_tiles}
+            manifest = load_manifest(image_output_dir, params['mode'])
+            fingerprint = source_fingerprint(image_path, manifest)
+            if manifest_is_current(manifest, fingerprint, params, sink):
+                log(f"   ⏭️  Tidak ada perubahan, dilewati: {sink.location}")
+                return SplitResult(image_path, True, skipped=len(manifest.get('tiles', {})),
+                                   location=sink.location, metrics=metrics.as_dict(0))
+            old_tiles = manifest.get('tiles', {}) if manifest and manifest.get('params') == params else {}
+            new_tiles = {}
+        
+        # Buka gambar
+        with open_image(image_path) as img:
+            load_image_plugin(format_name)
+            if reserve_memory is not None:
+                reserve_memory(decoded_size(img))
+            img_width, img_height = img.size
+            log(f"   Ukuran asli: {img_width}x{img_height}px")
+            log(f"   Rasio asli: {img_width/img_height:.2f}:1")
+            log(f"   Rasio target: {ratio_w}:{ratio_h} = {ratio_w/ratio_h:.2f}:1")
+            
+            # Hitung grid potongan berdasarkan rasio
+            plan = plan_ratio_tiles(img_width, img_height, ratio_w, ratio_h, target_width, leftover, max_tiles)
+            cols, rows = plan.cols, plan.rows
+            total_pieces = cols * rows
+            
+            log(f"   Dimensi potongan: {plan.piece_width}x{plan.piece_height}px")
+            log(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris = {total_pieces} potongan (sisa: {leftover})")
+            
+            piece_count = 0
+            skipped_count = 0
+            
+            mapped = open_mapped(image_path, img) if memory_map else None
+            streaming = mapped is None and streaming and can_read_bands(img)
+            if mapped is None and not streaming:
+                with metrics.stage('decode'):
+                    img.load()
+            reporter = ProgressReporter(total_pieces, progress, log)
+            resumable = journal is not None and output_sink == 'dir'
+            resumed_tiles = journal.tiles_done(image_path) if resumable else frozenset()
+            on_written = (lambda filename: journal.record_tile(image_path, filename)) if resumable else None
+            writer = BackgroundWriter(sink, metrics, write_queue, sync_every, on_written)
+            save_ratio_plan(image_output_dir, plan, (img_width, img_height),
+                            {'ratio_w': ratio_w, 'ratio_h': ratio_h, 'target_width': target_width,
+                             'leftover': leftover, 'max_tiles': max_tiles})
+            
+            try:
+                # Potong gambar
+                for row in range(rows):
+                    row_boxes = plan.boxes[row * cols:(row + 1) * cols]
+                    # Dengan leftover='pad', kotak bisa melewati tepi gambar
+                    band_top = max(row_boxes[0][3], 0)
+                    band_bottom = min(row_boxes[0][5], img_height)
                     
-                    # Simpan potongan
-                    piece.save(piece_path, quality=95, optimize=True)
-                    piece_count += 1
+                    if mapped is not None:
+                        source, y_offset = mapped, 0
+                    elif streaming:
+                        with metrics.stage('decode'):
+                            source, y_offset = read_band(img, band_top, band_bottom), band_top
+                    else:
+                        source, y_offset = img, 0
                     
-                    print(f"   ✅ Potongan {piece_count}/{total_pieces}: {piece_filename} ({piece.width}x{piece.height}px)")
+                    for _, col, left, top, right, bottom in row_boxes:
+                        # Crop gambar (area di luar gambar otomatis diisi pixel 0)
+                        with metrics.stage('crop'):
+                            piece = source.crop((left, top - y_offset, right, bottom - y_offset))
+                        
+                        # Nama file potongan
+                        actual_ratio = piece.width / piece.height
+                        piece_filename = f"{image_name}_ratio{ratio_w}-{ratio_h}_{row+1:02d}_{col+1:02d}{image_ext}"
+                        
+                        # Potongan yang sudah ditulis sebelum job terhenti
+                        if piece_filename in resumed_tiles:
+                            if incremental:
+                                new_tiles[piece_filename] = tile_digest(piece)
+                            skipped_count += 1
+                            continue
+                        
+                        # Lewati potongan yang isinya sama dengan run sebelumnya
+                        if incremental:
+                            new_tiles[piece_filename] = tile_digest(piece)
+                            if old_tiles.get(piece_filename) == new_tiles[piece_filename] and \
+                                    sink.keeps_existing and piece_filename in sink.existing:
+                                skipped_count += 1
+                                continue
+                        
+                        # Simpan potongan
+                        data = metrics.timed('encode', encode_piece, piece, format_name, save_options)
+                        writer.write(piece_filename, row + 1, col + 1, piece.size, data)
+                        metrics.add_bytes(len(data))
+                        piece_count += 1
+                        
+                        reporter.update(piece_count, f"   ✅ Potongan {piece_count}: {piece_filename}\n"
+                                                     f"      Ukuran: {piece.width}x{piece.height}px | "
+                                                     f"Rasio: {actual_ratio:.2f}:1")
+            finally:
+                writer.close()
+                reporter.close()
+            
+            if incremental:
+                save_manifest(image_output_dir, params['mode'], dict(fingerprint, params=params, tiles=new_tiles))
+                if skipped_count:
+                    log(f"   ⏭️  {skipped_count} potongan tidak berubah, dilewati")
             
-            print(f"   🎉 Selesai! {piece_count} potongan disimpan di: {image_output_dir}")
-            return True
+            log(f"   🎉 Selesai! {piece_count} potongan disimpan di: {sink.location}")
+            return SplitResult(image_path, True, tiles=piece_count, skipped=skipped_count, location=sink.location,
+                               metrics=metrics.as_dict(piece_count))
             
     except Exception as e:
-        print(f"   ❌ Error memproses gambar: {str(e)}")
-        return False
+        log(f"   ❌ Error memproses gambar: {str(e)}")
+        return SplitResult(image_path, False, error=str(e), metrics=metrics.as_dict(0))
 
-def split_image_by_ratio(image_path, output_dir, ratio_w, ratio_h):
-    """Memotong gambar berdasarkan rasio yang ditentukan"""
+def _write_tile_file(piece, piece_path, format_name, save_options):
+    """Meng-encode dan menulis satu potongan piramida (dipanggil dari worker).
+
+    Mengembalikan (byte tertulis, detik encode, detik write) untuk metrik.
+    """
+    data, encode_s = timed_call(encode_piece, piece, format_name, save_options)
+    _, write_s = timed_call(_write_atomic, piece_path, data)
+    return len(data), encode_s, write_s
+
+def split_image_pyramid(image_path, output_dir, tile_size=256, overlap=0, layout='dzi', workers=1,
+                        encode_profile=DEFAULT_ENCODE_PROFILE, output_format=None,
+                        encode_pool=DEFAULT_ENCODE_POOL, verbose=True):
+    """Membuat piramida tile (Deep Zoom/DZI atau XYZ) dari satu kali decode.
+
+    Level resolusi penuh dipotong lebih dulu, lalu setiap level berikutnya
+    dibuat dengan memperkecil level sebelumnya 2x (Image.reduce), sehingga
+    sumber tidak pernah di-decode atau di-resize ulang. Hanya satu level
+    yang disimpan di memori pada satu waktu.
+
+    Layout 'dzi': <nama>.dzi + <nama>_files/<level>/<kolom>_<baris>.<ext>
+    (level 0 = 1x1 pixel). Layout 'xyz': <nama>/<z>/<x>/<y>.<ext>
+    (z 0 = seluruh gambar dalam satu tile; overlap diabaikan). Klien XYZ
+    mengharapkan tile persegi tile_size, jadi tile tepi dan tile z 0
+    diisi pixel 0 di kanan/bawah (transparan untuk gambar dengan alpha).
+
+    Waktu memperkecil level dicatat sebagai tahap decode di metrik.
+    """
+    log = print if verbose else _silent
+    metrics = SplitMetrics()
+    if layout not in ('dzi', 'xyz'):
+        log(f"   ❌ Layout piramida tidak dikenal: {layout} (pilih: dzi, xyz)")
+        return SplitResult(image_path, False, error=f"Layout piramida tidak dikenal: {layout}",
+                           metrics=metrics.as_dict(0))
+    if layout == 'xyz':
+        overlap = 0
+    
     try:
-        # Buka gambar
-        with Image.open(image_path) as img:
+        with open_image(image_path) as img:
             img_width, img_height = img.size
             image_name = os.path.splitext(os.path.basename(image_path))[0]
-            image_ext = os.path.splitext(os.path.basename(image_path))[1]
-            
-            print(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
-            print(f"   Ukuran asli: {img_width}x{img_height}px")
-            print(f"   Rasio asli: {img_width/img_height:.2f}:1")
-            print(f"   Rasio target: {ratio_w}:{ratio_h} = {ratio_w/ratio_h:.2f}:1")
-            
-            # Hitung dimensi potongan berdasarkan rasio
-            target_ratio = ratio_w / ratio_h
-            
-            # Tentukan cara terbaik memotong gambar
-            if img_width / img_height > target_ratio:
-                # Gambar lebih lebar, potong secara horizontal
-                piece_height = img_height
-                piece_width = int(piece_height * target_ratio)
-                cols = img_width // piece_width
-                rows = 1
-                
-                # Sesuaikan jika ada sisa
-                if img_width % piece_width > piece_width * 0.5:
-                    cols += 1
-                    
+            image_ext = output_extension(os.path.splitext(os.path.basename(image_path))[1], output_format)
+            format_name, save_options = encode_settings(image_ext, encode_profile)
+            
+            log(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
+            log(f"   Ukuran asli: {img_width}x{img_height}px")
+            
+            # Level tertinggi: DZI sampai 1x1 pixel, XYZ sampai muat di satu tile
+            if layout == 'dzi':
+                max_level = math.ceil(math.log2(max(img_width, img_height))) if max(img_width, img_height) > 1 else 0
+                image_output_dir = os.path.join(output_dir, f"{image_name}_files")
             else:
-                # Gambar lebih tinggi, potong secara vertikal
-                piece_width = img_width
-                piece_height = int(piece_width / target_ratio)
-                rows = img_height // piece_height
-                cols = 1
+                max_level = max(0, math.ceil(math.log2(max(img_width, img_height) / tile_size)))
+                image_output_dir = os.path.join(output_dir, image_name)
+            
+            log(f"   Piramida {layout.upper()}: {max_level + 1} level, tile {tile_size}px")
+            
+            # Mode yang bisa diperkecil dengan reduce()
+            level_img = img if img.mode in ('RGB', 'RGBA', 'L', 'LA') else \
+                img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            with metrics.stage('decode'):
+                level_img.load()
+            
+            executor = open_encode_pool(workers, encode_pool)
+            pending = deque()
+            max_pending = workers * 2
+            piece_count = 0
+            
+            def record_tile(stats):
+                size, encode_s, write_s = stats
+                metrics.add('encode', encode_s)
+                metrics.add('write', write_s)
+                metrics.add_bytes(size)
+            
+            try:
+                for level in range(max_level, -1, -1):
+                    level_width, level_height = level_img.size
+                    cols = math.ceil(level_width / tile_size)
+                    rows = math.ceil(level_height / tile_size)
+                    level_dir = os.path.join(image_output_dir, str(level))
+                    
+                    for col in range(cols):
+                        col_dir = os.path.join(level_dir, str(col)) if layout == 'xyz' else level_dir
+                        os.makedirs(col_dir, exist_ok=True)
+                        
+                        for row in range(rows):
+                            # Overlap hanya ke arah yang punya tetangga
+                            left = max(col * tile_size - overlap, 0)
+                            top = max(row * tile_size - overlap, 0)
+                            if layout == 'xyz':
+                                # Crop di luar batas gambar otomatis diisi pixel 0
+                                right, bottom = left + tile_size, top + tile_size
+                            else:
+                                right = min((col + 1) * tile_size + overlap, level_width)
+                                bottom = min((row + 1) * tile_size + overlap, level_height)
+                            with metrics.stage('crop'):
+                                piece = level_img.crop((left, top, right, bottom))
+                            
+                            if layout == 'xyz':
+                                piece_path = os.path.join(col_dir, f"{row}{image_ext}")
+                            else:
+                                piece_path = os.path.join(level_dir, f"{col}_{row}{image_ext}")
+                            
+                            if executor is None:
+                                record_tile(_write_tile_file(piece, piece_path, format_name, save_options))
+                            else:
+                                pending.append(executor.submit(_write_tile_file, piece, piece_path,
+                                                               format_name, save_options))
+                                if len(pending) >= max_pending:
+                                    record_tile(pending.popleft().result())
+                            piece_count += 1
+                    
+                    log(f"   ✅ Level {level}: {level_width}x{level_height}px, {cols * rows} tile")
+                    
+                    # Level berikutnya dari level ini, bukan dari sumber
+                    if level > 0:
+                        with metrics.stage('decode'):
+                            level_img = level_img.reduce(2)
                 
-                # Sesuaikan jika ada sisa
-                if img_height % piece_height > piece_height * 0.5:
-                    rows += 1
+                while pending:
+                    record_tile(pending.popleft().result())
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
             
-            total_pieces = cols * rows
+            if layout == 'dzi':
+                dzi_path = os.path.join(output_dir, f"{image_name}.dzi")
+                with open(dzi_path, 'w', encoding='utf-8') as f:
+                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                            '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+                            f'Format="{image_ext.lstrip(".")}" Overlap="{overlap}" TileSize="{tile_size}">\n'
+                            f'  <Size Width="{img_width}" Height="{img_height}"/>\n'
+                            '</Image>\n')
+            
+            log(f"   🎉 Selesai! {piece_count} tile disimpan di: {image_output_dir}")
+            return SplitResult(image_path, True, tiles=piece_count, location=image_output_dir,
+                               metrics=metrics.as_dict(piece_count))
+    
+    except Exception as e:
+        log(f"   ❌ Error memproses gambar: {str(e)}")
+        return SplitResult(image_path, False, error=str(e), metrics=metrics.as_dict(0))
+
+def encode_animation(frames, format_name, save_options, durations, loop=None):
+    """Meng-encode potongan animasi dari list frame (dipanggil dari thread worker).
+
+    loop=None tidak menulis jumlah pengulangan, jadi animasi diputar sekali
+    seperti sumber GIF tanpa ekstensi NETSCAPE.
+    """
+    if loop is not None:
+        save_options = dict(save_options, loop=loop)
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format=format_name, save_all=True, append_images=frames[1:],
+                   duration=durations, disposal=2, **save_options)
+    return buffer.getvalue()
+
+def split_image_frames(image_path, output_dir, split_width, split_height, workers=1,
+                       encode_profile=DEFAULT_ENCODE_PROFILE, output_format=None, output_sink='dir',
+                       write_queue=DEFAULT_WRITE_QUEUE, encode_pool=DEFAULT_ENCODE_POOL, verbose=True,
+                       progress='tiles', **pixel_options):
+    """Memotong setiap frame GIF/WebP animasi atau halaman TIFF multi-halaman.
+
+    Frame di-decode berurutan sekali saja, potongan di-encode paralel di
+    pool encode_pool. Sumber animasi dengan format output yang mendukung animasi
+    (ANIMATED_FORMATS) menghasilkan potongan animasi dengan durasi frame
+    asli; sumber lain menghasilkan potongan per halaman
+    (<nama>_frame<n>_row<b>_col<k>). Potongan animasi menyimpan semua frame
+    potongan di memori sampai di-encode (sebesar seluruh animasi).
+
+    Gambar dengan satu frame diteruskan ke split_image_by_pixel bersama
+    pixel_options; untuk gambar multi-frame pixel_options diabaikan.
+    """
+    log = print if verbose else _silent
+    metrics = SplitMetrics()
+    try:
+        if output_sink == 'npy':
+            raise ValueError("Output npy tidak tersedia untuk gambar multi-frame")
+        
+        with open_image(image_path) as img:
+            frame_count = getattr(img, 'n_frames', 1)
+            if frame_count <= 1:
+                img.close()
+                return split_image_by_pixel(image_path, output_dir, split_width, split_height, workers=workers,
+                                            encode_profile=encode_profile, output_format=output_format,
+                                            output_sink=output_sink, write_queue=write_queue,
+                                            encode_pool=encode_pool, verbose=verbose, progress=progress,
+                                            **pixel_options)
+            
+            img_width, img_height = img.size
+            image_name = os.path.splitext(os.path.basename(image_path))[0]
+            image_ext = output_extension(os.path.splitext(os.path.basename(image_path))[1], output_format)
+            format_name, save_options = encode_settings(image_ext, encode_profile)
+            animated = getattr(img, 'is_animated', False) and img.format in ANIMATED_FORMATS and \
+                format_name in ANIMATED_FORMATS
+            
+            cols = math.ceil(img_width / split_width)
+            rows = math.ceil(img_height / split_height)
+            # Perkiraan dari ukuran frame pertama (halaman TIFF bisa berbeda ukuran)
+            total_pieces = cols * rows if animated else cols * rows * frame_count
             
-            print(f"   Dimensi potongan: {piece_width}x{piece_height}px")
-            print(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris = {total_pieces} potongan")
+            log(f"\n🖼️  Memproses: {os.path.basename(image_path)}")
+            log(f"   Ukuran asli: {img_width}x{img_height}px, {frame_count} frame")
+            if animated:
+                log(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris = {total_pieces} potongan animasi")
+            else:
+                log(f"   Akan dipotong menjadi: {cols} kolom x {rows} baris x {frame_count} frame = "
+                    f"{total_pieces} potongan")
+            ignored = sorted(name for name, value in pixel_options.items() if value and name != 'journal')
+            if ignored:
+                log(f"   ⚠️  Opsi diabaikan untuk gambar multi-frame: {', '.join(ignored)}")
             
-            # Buat folder output untuk gambar ini
             image_output_dir = os.path.join(output_dir, image_name)
             os.makedirs(image_output_dir, exist_ok=True)
             
+            sink = open_sink(output_sink, image_output_dir, f"{image_name}_frames")
+            executor = open_encode_pool(workers, encode_pool)
+            pending = deque()
+            max_pending = workers * 2
+            reporter = ProgressReporter(total_pieces, progress, log)
+            writer = BackgroundWriter(sink, metrics, write_queue)
             piece_count = 0
             
-            # Potong gambar
-            for row in range(rows):
-                for col in range(cols):
-                    # Hitung koordinat crop
-                    left = col * piece_width
-                    top = row * piece_height
-                    right = min(left + piece_width, img_width)
-                    bottom = min(top + piece_height, img_height)
-                    
-                    # Skip jika area terlalu kecil
-                    if (right - left) < piece_width * 0.5 or (bottom - top) < piece_height * 0.5:
-                        continue
-                    
-                    # Crop gambar
-                    piece = img.crop((left, top, right, bottom))
-                    
-                    # Nama file potongan
-                    actual_ratio = piece.width / piece.height
-                    piece_filename = f"{image_name}_ratio{ratio_w}-{ratio_h}_{row+1:02d}_{col+1:02d}{image_ext}"
-                    piece_path = os.path.join(image_output_dir, piece_filename)
-                    
-                    # Simpan potongan
-                    piece.save(piece_path, quality=95, optimize=True)
-                    piece_count += 1
-                    
-                    print(f"   ✅ Potongan {piece_count}: {piece_filename}")
-                    print(f"      Ukuran: {piece.width}x{piece.height}px | Rasio: {actual_ratio:.2f}:1")
+            def finish_piece(future, piece_filename, row_key, col, piece_size):
+                nonlocal piece_count
+                data, seconds = future.result() if isinstance(future, futures.Future) else future
+                metrics.add('encode', seconds)
+                writer.write(piece_filename, row_key, col, piece_size, data)
+                metrics.add_bytes(len(data))
+                piece_count += 1
+                reporter.update(piece_count, f"   ✅ Potongan {piece_count}/{total_pieces}: {piece_filename} "
+                                             f"({piece_size[0]}x{piece_size[1]}px)")
+            
+            def submit(task, piece_filename, row_key, col, piece_size):
+                if executor is None:
+                    finish_piece(timed_call(*task), piece_filename, row_key, col, piece_size)
+                    return
+                pending.append((executor.submit(timed_call, *task), piece_filename, row_key, col, piece_size))
+                if len(pending) >= max_pending:
+                    finish_piece(*pending.popleft())
             
-            print(f"   🎉 Selesai! {piece_count} potongan disimpan di: {image_output_dir}")
-            return True
+            def grid_boxes(width, height):
+                return [(row, col, (col * split_width, row * split_height,
+                                    min((col + 1) * split_width, width), min((row + 1) * split_height, height)))
+                        for row in range(math.ceil(height / split_height))
+                        for col in range(math.ceil(width / split_width))]
+            
+            try:
+                if animated:
+                    # Kumpulkan potongan setiap frame, lalu encode satu animasi per posisi
+                    boxes = grid_boxes(img_width, img_height)
+                    tile_frames = [[] for _ in boxes]
+                    durations = []
+                    for frame in range(frame_count):
+                        with metrics.stage('decode'):
+                            img.seek(frame)
+                            # Frame GIF setelah yang pertama sudah berupa kanvas penuh (disposal diterapkan)
+                            frame_img = img.convert('RGBA')
+                        durations.append(img.info.get('duration', 100))
+                        with metrics.stage('crop'):
+                            for frames, (_, _, box) in zip(tile_frames, boxes):
+                                frames.append(frame_img.crop(box))
+                    # Sumber tanpa 'loop' diputar sekali; jangan dijadikan pengulangan tanpa henti
+                    loop = img.info.get('loop')
+                    
+                    for frames, (row, col, _) in zip(tile_frames, boxes):
+                        piece_filename = f"{image_name}_row{row+1:02d}_col{col+1:02d}{image_ext}"
+                        submit((encode_animation, frames, format_name, save_options,
+                                durations, loop), piece_filename, row + 1, col + 1, frames[0].size)
+                    tile_frames = None
+                else:
+                    for frame in range(frame_count):
+                        with metrics.stage('decode'):
+                            img.seek(frame)
+                            img.load()
+                        # Halaman TIFF bisa berbeda ukuran: grid dihitung per halaman
+                        for row, col, box in grid_boxes(*img.size):
+                            with metrics.stage('crop'):
+                                piece = img.crop(box)
+                            piece_filename = (f"{image_name}_frame{frame+1:03d}_row{row+1:02d}_col{col+1:02d}"
+                                              f"{image_ext}")
+                            submit((encode_piece, piece, format_name, save_options),
+                                   piece_filename, f"{frame+1}:{row+1}", col + 1, piece.size)
+                
+                while pending:
+                    finish_piece(*pending.popleft())
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                writer.close()
+                reporter.close()
             
+            log(f"   🎉 Selesai! {piece_count} potongan disimpan di: {sink.location}")
+            return SplitResult(image_path, True, tiles=piece_count, location=sink.location,
+                               metrics=metrics.as_dict(piece_count))
+    
     except Exception as e:
-        print(f"   ❌ Error memproses gambar: {str(e)}")
-        return False
+        log(f"   ❌ Error memproses gambar: {str(e)}")
+        return SplitResult(image_path, False, error=str(e), metrics=metrics.as_dict(0))
 
-def split_image(image_path, output_dir, mode, param1, param2):
-    """Wrapper function untuk memilih mode pemotongan"""
-    if mode == 'pixel':
-        return split_image_by_pixel(image_path, output_dir, param1, param2)
+def split_image(image_path, output_dir, mode, param1, param2, workers=1, journal=None, **options):
+    """Wrapper function untuk memilih mode pemotongan.
+
+    Mode 'pixel' (lebar, tinggi), 'ratio' (rasio lebar, rasio tinggi), atau
+    'dzi'/'xyz' (ukuran tile, overlap) untuk piramida tile.
+    options diteruskan ke fungsi split (streaming, memory_map, incremental,
+    lossless_jpeg, encode_profile, output_format, output_sink, skip_blank,
+    dedupe, output_size, verbose, progress). Di mode 'pixel', frames=True
+    memotong setiap frame/halaman gambar multi-frame (lihat split_image_frames).
+    Dengan journal (JobJournal), gambar yang sudah selesai di job sebelumnya
+    dilewati dan gambar yang berhasil dicatat selesai.
+    Mengembalikan SplitResult.
+    """
+    if journal is not None:
+        done = journal.completed(image_path)
+        if done:
+            if options.get('verbose', True):
+                print(f"\n⏭️  {os.path.basename(image_path)} sudah selesai di job sebelumnya, dilewati")
+            return SplitResult(image_path, True, skipped=done['tiles'], location=done['location'])
+        journal.start_image(image_path)
+    
+    frames = options.pop('frames', False)
+    if mode == 'pixel' and frames:
+        result = split_image_frames(image_path, output_dir, param1, param2, workers=workers,
+                                    journal=journal, **options)
+    elif mode == 'pixel':
+        result = split_image_by_pixel(image_path, output_dir, param1, param2, workers=workers,
+                                      journal=journal, **options)
+    elif mode in ('dzi', 'xyz'):
+        result = split_image_pyramid(image_path, output_dir, param1, param2, layout=mode, workers=workers, **options)
     else:  # mode == 'ratio'
-        return split_image_by_ratio(image_path, output_dir, param1, param2)
+        result = split_image_by_ratio(image_path, output_dir, param1, param2, journal=journal, **options)
+    
+    if journal is not None and result:
+        journal.finish_image(result)
+    return result
+
+def decoded_size(img):
+    """Ukuran gambar yang sudah dibuka setelah di-decode (byte), dari header saja"""
+    return img.width * img.height * len(img.getbands())
+
+def estimate_decoded_size(image_path):
+    """Memperkirakan ukuran gambar setelah di-decode (byte) hanya dari header"""
+    try:
+        with open_image(image_path) as img:
+            return decoded_size(img)
+    except Exception:
+        return 0
+
+def split_images_batch(image_paths, output_dir, mode, param1, param2,
+                       workers=DEFAULT_WORKERS, max_memory_mb=DEFAULT_BATCH_MEMORY_MB, **options):
+    """Memproses banyak gambar sekaligus dengan worker pool terbatas.
+
+    Setiap gambar "memesan" perkiraan memori decode-nya sebelum mulai diproses.
+    Jika total pesanan melebihi max_memory_mb, gambar berikutnya menunggu sampai
+    ada gambar lain yang selesai. Gambar yang lebih besar dari batas tetap
+    diproses, tetapi sendirian. Di mode pixel dan rasio pesanan dibuat setelah
+    cek incremental, jadi gambar yang dilewati tidak dibuka sama sekali.
+    Mengembalikan list SplitResult dengan urutan yang sama dengan
+    image_paths. options diteruskan ke split_image.
+    """
+    budget = max_memory_mb * 1024 * 1024
+    in_flight = 0
+    budget_lock = threading.Condition()
+    
+    def run_one(image_path):
+        nonlocal in_flight
+        reserved = []
+        
+        def reserve_memory(needed):
+            nonlocal in_flight
+            with budget_lock:
+                budget_lock.wait_for(lambda: in_flight == 0 or in_flight + needed <= budget)
+                in_flight += needed
+            reserved.append(needed)
+        
+        image_options = options
+        if mode in ('pixel', 'ratio') and not options.get('frames'):
+            image_options = dict(options, reserve_memory=reserve_memory)
+        else:
+            reserve_memory(estimate_decoded_size(image_path))
+        try:
+            return split_image(image_path, output_dir, mode, param1, param2, **image_options)
+        finally:
+            with budget_lock:
+                in_flight -= sum(reserved)
+                budget_lock.notify_all()
+    
+    with futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = [executor.submit(run_one, image_path) for image_path in image_paths]
+        return [future.result() for future in pending]
+
+def summarize_metrics(results, wall_s):
+    """Ringkasan metrik batch: total per tahap, byte tertulis, dan tile/detik"""
+    summary = {f"{stage}_s": 0.0 for stage in METRIC_STAGES}
+    for result in results:
+        for stage in METRIC_STAGES:
+            summary[f"{stage}_s"] += result.metrics.get(f"{stage}_s", 0.0)
+    tiles = sum(result.tiles for result in results)
+    summary.update(images=len(results), succeeded=sum(1 for result in results if result), tiles=tiles,
+                   bytes_written=sum(result.metrics.get('bytes_written', 0) for result in results),
+                   wall_s=round(wall_s, 6), tiles_per_s=round(tiles / wall_s, 3) if wall_s > 0 else None)
+    return summary
+
+def write_metrics_json(results, path, wall_s):
+    """Menulis metrik sebagai JSON lines: satu baris per gambar dan satu baris ringkasan batch"""
+    lines = [json.dumps(dict(result.as_dict(), type='image')) for result in results]
+    lines.append(json.dumps(dict(summarize_metrics(results, wall_s), type='batch')))
+    _write_atomic(path, '\n'.join(lines) + '\n')
+
+def _prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def write_metrics_prometheus(results, path, wall_s):
+    """Menulis metrik dalam format teks Prometheus (untuk textfile collector node_exporter)"""
+    lines = [
+        '# HELP split_image_stage_seconds Waktu per tahap pemotongan per gambar.',
+        '# TYPE split_image_stage_seconds gauge',
+    ]
+    for result in results:
+        image = _prometheus_label(result.image_path)
+        for stage in METRIC_STAGES:
+            lines.append(f'split_image_stage_seconds{{image="{image}",stage="{stage}"}} '
+                         f'{result.metrics.get(f"{stage}_s", 0.0)}')
+    per_image = (
+        ('split_image_tiles', 'Jumlah potongan yang ditulis per gambar.', lambda result: result.tiles),
+        ('split_image_bytes_written', 'Byte yang ditulis per gambar.',
+         lambda result: result.metrics.get('bytes_written', 0)),
+        ('split_image_success', 'Status gambar (1 berhasil, 0 gagal).', lambda result: int(bool(result))),
+    )
+    for name, help_text, value in per_image:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for result in results:
+            lines.append(f'{name}{{image="{_prometheus_label(result.image_path)}"}} {value(result)}')
+
+    summary = summarize_metrics(results, wall_s)
+    for name, key in (('split_image_batch_wall_seconds', 'wall_s'), ('split_image_batch_tiles', 'tiles'),
+                      ('split_image_batch_bytes_written', 'bytes_written'),
+                      ('split_image_batch_tiles_per_second', 'tiles_per_s')):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {summary[key] or 0}')
+    _write_atomic(path, '\n'.join(lines) + '\n')
+
+def parse_size(text):
+    """Mengubah 'LEBARxTINGGI' (mis. '640x480') menjadi (lebar, tinggi); ValueError jika tidak valid"""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Ukuran harus LEBARxTINGGI (contoh: 640x480), bukan '{text}'")
+    if width <= 0 or height <= 0:
+        raise ValueError("Lebar dan tinggi harus lebih dari 0")
+    return width, height
+
+def parse_ratio(text):
+    """Mengubah 'LEBAR:TINGGI' (mis. '4:5') menjadi (rasio_lebar, rasio_tinggi); ValueError jika tidak valid"""
+    try:
+        ratio_w, ratio_h = (float(part) for part in text.split(':'))
+    except ValueError:
+        raise ValueError(f"Rasio harus LEBAR:TINGGI (contoh: 4:5), bukan '{text}'")
+    if ratio_w <= 0 or ratio_h <= 0:
+        raise ValueError("Nilai rasio harus lebih dari 0")
+    return ratio_w, ratio_h
+
+def _cli_type(parse):
+    """Membungkus parse_size/parse_ratio sebagai type= argparse (pesan ValueError ditampilkan apa adanya)"""
+    def convert(text):
+        try:
+            return parse(text)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    convert.__name__ = parse.__name__
+    return convert
+
+def collect_image_paths(inputs):
+    """Mengubah daftar file/folder menjadi daftar path gambar"""
+    image_paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            image_paths.extend(os.path.join(path, name) for name in sorted(get_available_images(path)))
+        else:
+            image_paths.append(path)
+    return image_paths
+
+def split(inputs, output_dir='output', mode='pixel', width=None, height=None, ratio=None,
+          tile_size=256, overlap=0, workers=DEFAULT_WORKERS, max_memory_mb=DEFAULT_BATCH_MEMORY_MB,
+          resume=False, verbose=False, **options):
+    """API library untuk memotong gambar tanpa prompt dan tanpa output console.
+
+    inputs berupa path file/folder atau list-nya. Parameter yang dipakai
+    tergantung mode: width/height ('pixel'), ratio 'w:h' atau (w, h)
+    ('ratio'), tile_size/overlap ('dzi', 'xyz'); overlap juga berlaku untuk
+    'pixel'. Dengan resume=True progress job dicatat di jurnal folder
+    output, dan job yang terhenti dengan input dan parameter yang sama
+    dilanjutkan (lihat JobJournal). options diteruskan ke split_image.
+    Mengembalikan list SplitResult sesuai urutan gambar (kosong jika tidak
+    ada gambar di inputs).
+    """
+    if mode == 'pixel':
+        if not width or not height:
+            raise ValueError("Mode pixel membutuhkan width dan height")
+        params = (width, height)
+        if overlap:
+            options['overlap'] = overlap
+    elif mode == 'ratio':
+        if ratio is None:
+            raise ValueError("Mode ratio membutuhkan ratio")
+        params = parse_ratio(ratio) if isinstance(ratio, str) else tuple(ratio)
+    elif mode in ('dzi', 'xyz'):
+        params = (tile_size, overlap)
+    else:
+        raise ValueError(f"Mode tidak dikenal: {mode} (pilih: pixel, ratio, dzi, xyz)")
+    
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = [inputs]
+    image_paths = collect_image_paths(inputs)
+    if not image_paths:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    
+    journal = JobJournal(output_dir, journal_job(mode, params, options, image_paths), resume=True) if resume else None
+    results = []
+    try:
+        if len(image_paths) == 1:
+            results = [split_image(image_paths[0], output_dir, mode, *params, workers=workers, verbose=verbose,
+                                   journal=journal, **options)]
+        else:
+            results = split_images_batch(image_paths, output_dir, mode, *params, workers=workers,
+                                         max_memory_mb=max_memory_mb, verbose=verbose, journal=journal, **options)
+    finally:
+        if journal is not None:
+            journal.close(finished=bool(results) and all(results))
+    return results
+
+def build_parser():
+    """Parser argumen untuk mode non-interaktif"""
+    parser = argparse.ArgumentParser(
+        prog='split_image.py',
+        description="Memotong gambar menjadi potongan kecil tanpa prompt. "
+                    "Jalankan tanpa argumen untuk mode interaktif.")
+    parser.add_argument('inputs', nargs='+', help="file gambar atau folder berisi gambar")
+    parser.add_argument('-o', '--output', default='output', help="folder output (default: output)")
+    parser.add_argument('-m', '--mode', choices=('pixel', 'ratio', 'dzi', 'xyz'), default='pixel',
+                        help="mode pemotongan (default: pixel)")
+    parser.add_argument('-s', '--size', type=_cli_type(parse_size), help="ukuran potongan LEBARxTINGGI untuk mode pixel")
+    parser.add_argument('--output-size', type=_cli_type(parse_size), metavar='LEBARxTINGGI',
+                        help="ubah setiap potongan mode pixel tepat ke ukuran ini (decode resolusi rendah)")
+    parser.add_argument('-r', '--ratio', type=_cli_type(parse_ratio), help="rasio LEBAR:TINGGI untuk mode ratio")
+    parser.add_argument('--target-width', type=int, help="lebar potongan mode ratio dalam pixel (default: sebesar mungkin)")
+    parser.add_argument('--leftover', choices=RATIO_LEFTOVERS, default=DEFAULT_RATIO_LEFTOVER,
+                        help=f"sisa gambar mode ratio: crop, pad, atau distribute (default: {DEFAULT_RATIO_LEFTOVER})")
+    parser.add_argument('--max-tiles', type=int, help="jumlah potongan maksimal per gambar di mode ratio")
+    parser.add_argument('--tile-size', type=int, default=256, help="ukuran tile piramida (default: 256)")
+    parser.add_argument('--overlap', type=int, default=0,
+                        help="overlap antar potongan dalam pixel untuk mode pixel dan dzi (default: 0)")
+    parser.add_argument('--pad-edges', action='store_true',
+                        help="isi potongan tepi sampai ukuran penuh (otomatis untuk --sink npy)")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"jumlah worker (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--max-memory-mb', type=int, default=DEFAULT_BATCH_MEMORY_MB,
+                        help=f"batas memori batch dalam MB (default: {DEFAULT_BATCH_MEMORY_MB})")
+    parser.add_argument('-f', '--format', dest='output_format', help="format potongan, mis. webp (default: sama dengan sumber)")
+    parser.add_argument('-p', '--profile', dest='encode_profile', choices=tuple(ENCODE_PROFILES),
+                        default=DEFAULT_ENCODE_PROFILE, help=f"profil encoding (default: {DEFAULT_ENCODE_PROFILE})")
+    parser.add_argument('--sink', dest='output_sink', choices=tuple(OUTPUT_SINKS), default='dir',
+                        help="tujuan potongan: dir, zip, pack, atau npy (npy hanya mode pixel, default: dir)")
+    parser.add_argument('--incremental', action='store_true', help="lewati gambar/potongan yang tidak berubah")
+    parser.add_argument('--resume', action='store_true',
+                        help="catat progress di jurnal folder output dan lanjutkan job yang terhenti")
+    parser.add_argument('--lossless-jpeg', action='store_true', help="potong JPEG tanpa re-encode dengan jpegtran")
+    parser.add_argument('--frames', action='store_true',
+                        help="potong setiap frame GIF animasi/halaman TIFF (mode pixel)")
+    parser.add_argument('--skip-blank', action='store_true', help="jangan tulis ulang potongan seragam")
+    parser.add_argument('--blank-tolerance', type=int, metavar='N',
+                        help="selisih pixel per band yang masih dianggap seragam untuk --skip-blank (default: 0)")
+    parser.add_argument('--dedupe', action='store_true', help="jangan tulis ulang potongan yang identik")
+    parser.add_argument('--no-streaming', dest='streaming', action='store_false', help="selalu decode gambar penuh")
+    parser.add_argument('--no-mmap', dest='memory_map', action='store_false', help="jangan memetakan file dengan mmap")
+    parser.add_argument('--max-image-pixels', type=int, metavar='N',
+                        help="tolak gambar sumber lebih dari N pixel (default: tanpa batas)")
+    parser.add_argument('--encode-pool', choices=ENCODE_POOLS, default=DEFAULT_ENCODE_POOL,
+                        help="pool encode paralel: thread atau process (untuk format yang encoder-nya "
+                             f"menahan GIL, default: {DEFAULT_ENCODE_POOL})")
+    parser.add_argument('--write-queue', type=int, default=DEFAULT_WRITE_QUEUE,
+                        help=f"jumlah potongan yang boleh antre ditulis, 0 = tulis langsung (default: {DEFAULT_WRITE_QUEUE})")
+    parser.add_argument('--sync-every', type=int, metavar='N', help="fsync output setiap N potongan")
+    parser.add_argument('-q', '--quiet', action='store_true', help="tanpa output per potongan")
+    parser.add_argument('--progress', choices=('tiles', 'bar', 'none'), default='tiles',
+                        help="tampilan progress: per potongan, progress bar, atau tidak ada (default: tiles)")
+    parser.add_argument('--metrics-json', metavar='PATH', help="tulis metrik per gambar dan batch sebagai JSON lines")
+    parser.add_argument('--metrics-prom', metavar='PATH', help="tulis metrik dalam format teks Prometheus")
+    parser.add_argument('--json', action='store_true', help="cetak hasil sebagai JSON")
+    return parser
+
+def run_cli(argv=None):
+    """Menjalankan mode non-interaktif. Mengembalikan exit code (0 jika semua berhasil)"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.mode == 'pixel' and args.size is None:
+        parser.error("mode pixel membutuhkan --size LEBARxTINGGI")
+    if args.mode == 'ratio' and args.ratio is None:
+        parser.error("mode ratio membutuhkan --ratio LEBAR:TINGGI")
+    if args.blank_tolerance is not None and not args.skip_blank:
+        parser.error("--blank-tolerance hanya berlaku bersama --skip-blank")
+    
+    if args.max_image_pixels is not None:
+        set_max_image_pixels(args.max_image_pixels)
+    
+    options = {'encode_profile': args.encode_profile, 'output_format': args.output_format}
+    if args.mode in ('pixel', 'ratio'):
+        options.update(streaming=args.streaming, memory_map=args.memory_map,
+                       incremental=args.incremental, output_sink=args.output_sink, progress=args.progress,
+                       write_queue=args.write_queue, sync_every=args.sync_every)
+    if args.mode != 'ratio':
+        options['encode_pool'] = args.encode_pool
+    if args.mode == 'ratio':
+        options.update(target_width=args.target_width, leftover=args.leftover, max_tiles=args.max_tiles)
+    if args.mode == 'pixel':
+        skip_blank = (args.blank_tolerance or 0) if args.skip_blank else None
+        options.update(lossless_jpeg=args.lossless_jpeg, skip_blank=skip_blank, dedupe=args.dedupe,
+                       pad_edges=args.pad_edges, output_size=args.output_size, frames=args.frames)
+    
+    width, height = args.size or (None, None)
+    started = time.perf_counter()
+    results = split(args.inputs, args.output, args.mode, width=width, height=height, ratio=args.ratio,
+                    tile_size=args.tile_size, overlap=args.overlap, workers=args.workers,
+                    max_memory_mb=args.max_memory_mb, resume=args.resume, verbose=not (args.quiet or args.json), **options)
+    wall_s = time.perf_counter() - started
+    
+    if args.metrics_json:
+        write_metrics_json(results, args.metrics_json, wall_s)
+    if args.metrics_prom:
+        write_metrics_prometheus(results, args.metrics_prom, wall_s)
+    
+    success_count = sum(1 for result in results if result)
+    if args.json:
+        print(json.dumps([result.as_dict() for result in results], indent=2))
+    else:
+        for result in results:
+            if not result:
+                print(f"❌ {result.image_path}: {result.error}", file=sys.stderr)
+        if results:
+            print(f"✅ Berhasil: {success_count}/{len(results)} gambar")
+    
+    if not results:
+        print("❌ Tidak ada gambar yang ditemukan di input", file=sys.stderr)
+        return 1
+    return 0 if success_count == len(results) else 1
 
 def main():
     """Fungsi utama program"""
@@ -290,13 +2461,23 @@ def main():
         return
     
     # Tampilkan daftar gambar
-    display_images(images)
+    page = 0
+    pages = math.ceil(len(images) / IMAGES_PER_PAGE)
+    display_images(images, page)
     
     # Pilih gambar
     print(f"\n🔍 Pilih gambar yang ingin dipotong:")
     while True:
         try:
-            choice = input(f"Masukkan nomor gambar (1-{len(images)}) atau 'all' untuk semua gambar: ").strip().lower()
+            prompt = f"Masukkan nomor gambar (1-{len(images)}) atau 'all' untuk semua gambar"
+            if pages > 1:
+                prompt += " ('n'/'p' untuk halaman berikutnya/sebelumnya)"
+            choice = input(prompt + ": ").strip().lower()
+            
+            if choice in ('n', 'p') and pages > 1:
+                page = min(page + 1, pages - 1) if choice == 'n' else max(page - 1, 0)
+                display_images(images, page)
+                continue
             
             if choice == 'all':
                 selected_images = images
@@ -313,11 +2494,12 @@ def main():
     
     # Dapatkan mode dan dimensi potongan
     mode, param1, param2 = get_user_input()
+    leftover = get_leftover_choice() if mode == 'ratio' else None
     
     if mode == 'pixel':
         print(f"\n📏 Mode terpilih: PIXEL ({param1}x{param2}px)")
     else:
-        print(f"\n📐 Mode terpilih: RASIO ({param1}:{param2})")
+        print(f"\n📐 Mode terpilih: RASIO ({param1}:{param2}, sisa: {leftover})")
     
     # Buat folder output
     output_dir = os.path.join(os.getcwd(), 'output')
@@ -327,12 +2509,31 @@ def main():
     print(f"\n🚀 Mulai memproses {len(selected_images)} gambar...")
     print("=" * 50)
     
-    success_count = 0
+    image_paths = [os.path.join('images', image_name) for image_name in selected_images]
+    options = {'streaming': True, 'memory_map': True, 'incremental': True}
+    if mode == 'pixel':
+        options.update(lossless_jpeg=True, frames=True)
+    else:
+        options['leftover'] = leftover
+    
+    # Job yang terhenti (OOM, proses dimatikan) dengan parameter sama dilanjutkan dari jurnal
+    journal = JobJournal(output_dir, journal_job(mode, (param1, param2), options, image_paths), resume=True)
+    if journal.resumed:
+        print("♻️  Melanjutkan job sebelumnya yang terhenti")
     
-    for image_name in selected_images:
-        image_path = os.path.join('images', image_name)
-        if split_image(image_path, output_dir, mode, param1, param2):
-            success_count += 1
+    results = []
+    try:
+        if len(image_paths) > 1:
+            # Banyak gambar: paralel di level gambar
+            results = split_images_batch(image_paths, output_dir, mode, param1, param2,
+                                         journal=journal, **options)
+        else:
+            # Satu gambar: paralel di level potongan
+            results = [split_image(image_paths[0], output_dir, mode, param1, param2,
+                                   workers=DEFAULT_WORKERS, journal=journal, **options)]
+    finally:
+        journal.close(finished=bool(results) and all(results))
+    success_count = sum(1 for result in results if result)
     
     # Ringkasan hasil
     print("\n" + "=" * 50)
@@ -343,11 +2544,20 @@ def main():
     
     input("\nTekan Enter untuk keluar...")
 
-if __name__ == "__main__":
+def entry_point():
+    """Titik masuk command line (dipakai split_image.py dan split.py)"""
+    # Dengan argumen: mode non-interaktif (untuk cron/job queue)
+    if len(sys.argv) > 1:
+        return run_cli()
+    
     try:
         main()
     except KeyboardInterrupt:
         print("\n\n👋 Program dihentikan oleh user.")
     except Exception as e:
         print(f"\n❌ Terjadi error yang tidak terduga: {str(e)}")
-        input("\nTekan Enter untuk keluar...")
\ No newline at end of file
+        input("\nTekan Enter untuk keluar...")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(entry_point())
\ No newline at end of file
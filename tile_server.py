@@ -0,0 +1,244 @@
+"""
+Server tile untuk program split image
+Memotong potongan sesuai permintaan HTTP tanpa menyimpan hasil split ke disk:
+
+    GET /                                   -> daftar gambar (JSON)
+    GET /<gambar>/<lebar>x<tinggi>/<baris>/<kolom>
+
+Baris dan kolom mulai dari 1, sama dengan nama file split_image_by_pixel
+(<nama>_row01_col01). Gambar sumber yang sudah di-decode dan potongan yang
+sudah di-encode disimpan di cache LRU berbatas ukuran, sehingga gambar
+yang sering diminta dilayani dari memori dan gambar baru hanya di-decode
+sekali.
+
+    python tile_server.py --images images --port 8000
+"""
+
+import os
+import json
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import split_image
+
+# Batas default cache gambar ter-decode dan potongan ter-encode (MB)
+DEFAULT_SOURCE_CACHE_MB = 1024
+DEFAULT_TILE_CACHE_MB = 256
+
+class LRUCache:
+    """Cache LRU berbatas total ukuran (byte), aman dipakai dari banyak thread.
+
+    Item terbaru selalu disimpan walaupun lebih besar dari batas: item itu
+    menjadi satu-satunya isi cache dan dikeluarkan pada put berikutnya.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.items.get(key)
+            if entry is None:
+                return None
+            self.items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            if key in self.items:
+                self.size -= self.items.pop(key)[1]
+            self.items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes and len(self.items) > 1:
+                _, (_, evicted_size) = self.items.popitem(last=False)
+                self.size -= evicted_size
+
+class TileSource:
+    """Memotong dan meng-encode potongan dari gambar di images_dir dengan cache.
+
+    Gambar tanpa kompresi dipetakan dengan mmap (split_image.open_mapped),
+    gambar lain di-decode penuh sekali. Permintaan bersamaan untuk gambar
+    yang belum ada di cache menunggu satu decode yang sama.
+    """
+
+    def __init__(self, images_dir, source_cache_mb=DEFAULT_SOURCE_CACHE_MB, tile_cache_mb=DEFAULT_TILE_CACHE_MB,
+                 encode_profile=split_image.DEFAULT_ENCODE_PROFILE, output_format=None):
+        self.images_dir = images_dir
+        self.sources = LRUCache(source_cache_mb * 1024 * 1024)
+        self.tiles = LRUCache(tile_cache_mb * 1024 * 1024)
+        self.encode_profile = encode_profile
+        self.output_format = output_format
+        self.decode_locks = {}
+        self.decode_locks_lock = threading.Lock()
+
+    def image_path(self, image_name):
+        """Path gambar, atau None jika nama tidak ada di images_dir (mencegah akses ke luar folder)"""
+        if image_name != os.path.basename(image_name) or not image_name.lower().endswith(split_image.SUPPORTED_FORMATS):
+            return None
+        path = os.path.join(self.images_dir, image_name)
+        return path if os.path.isfile(path) else None
+
+    def _decode(self, image_path):
+        img = split_image.open_image(image_path)
+        mapped = split_image.open_mapped(image_path, img)
+        if mapped is not None:
+            img.close()
+            return mapped
+        img.load()
+        return img
+
+    def source(self, image_path, mtime_ns):
+        """Gambar ter-decode dari cache, atau di-decode sekali untuk semua permintaan yang menunggu"""
+        key = (image_path, mtime_ns)
+        img = self.sources.get(key)
+        if img is not None:
+            return img
+
+        with self.decode_locks_lock:
+            lock = self.decode_locks.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                img = self.sources.get(key)
+                if img is None:
+                    img = self._decode(image_path)
+                    self.sources.put(key, img, img.width * img.height * len(img.getbands()))
+            finally:
+                # Lock dilepas setelah hasil tersimpan di cache, jadi permintaan berikutnya memakai cache
+                with self.decode_locks_lock:
+                    if self.decode_locks.get(key) is lock:
+                        del self.decode_locks[key]
+        return img
+
+    def tile(self, image_path, tile_width, tile_height, row, col):
+        """Mengembalikan (bytes, format, cache hit) untuk satu potongan, atau None jika di luar gambar.
+
+        Posisi potongan dicek dengan ukuran gambar di cache, atau dari header
+        gambar jika belum pernah di-decode, jadi URL yang salah tidak memicu
+        decode penuh.
+        """
+        if row < 1 or col < 1:
+            return None
+        image_ext = split_image.output_extension(os.path.splitext(image_path)[1], self.output_format)
+        format_name, save_options = split_image.encode_settings(image_ext, self.encode_profile)
+        mtime_ns = os.stat(image_path).st_mtime_ns
+        key = (image_path, mtime_ns, tile_width, tile_height, row, col, image_ext)
+        data = self.tiles.get(key)
+        if data is not None:
+            return data, format_name, True
+
+        # Koordinat sama dengan split_image_by_pixel (baris/kolom mulai dari 1)
+        left = (col - 1) * tile_width
+        top = (row - 1) * tile_height
+        img = self.sources.get((image_path, mtime_ns))
+        size = img.size if img is not None else split_image.read_image_size(image_path)
+        if size is not None and (left >= size[0] or top >= size[1]):
+            return None
+
+        if img is None:
+            img = self.source(image_path, mtime_ns)
+        if left >= img.width or top >= img.height:
+            return None
+        piece = img.crop((left, top, min(left + tile_width, img.width), min(top + tile_height, img.height)))
+        data = split_image.encode_piece(piece, format_name, save_options)
+        self.tiles.put(key, data, len(data))
+        return data, format_name, False
+
+def make_handler(tile_source):
+    """Membuat kelas handler HTTP yang melayani potongan dari tile_source"""
+
+    class TileHandler(BaseHTTPRequestHandler):
+
+        def send_body(self, status, body, content_type, extra_headers=()):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in extra_headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_error_json(self, status, message):
+            self.send_body(status, json.dumps({'error': message}).encode('utf-8'), 'application/json')
+
+        def do_GET(self):
+            parts = [unquote(part) for part in urlsplit(self.path).path.split('/') if part]
+            if not parts:
+                images = split_image.get_available_images(tile_source.images_dir)
+                self.send_body(200, json.dumps({'images': images}).encode('utf-8'), 'application/json')
+                return
+            if len(parts) != 4:
+                self.send_error_json(404, "Gunakan /<gambar>/<lebar>x<tinggi>/<baris>/<kolom>")
+                return
+
+            image_name, size, row, col = parts
+            image_path = tile_source.image_path(image_name)
+            if image_path is None:
+                self.send_error_json(404, f"Gambar tidak ditemukan: {image_name}")
+                return
+            try:
+                tile_width, tile_height = split_image.parse_size(size)
+                row, col = int(row), int(col)
+            except ValueError:
+                self.send_error_json(400, "Ukuran harus LEBARxTINGGI, baris dan kolom harus angka")
+                return
+
+            try:
+                result = tile_source.tile(image_path, tile_width, tile_height, row, col)
+            except Exception as e:
+                self.send_error_json(500, str(e))
+                return
+            if result is None:
+                self.send_error_json(404, f"Potongan baris {row} kolom {col} di luar gambar")
+                return
+
+            data, format_name, hit = result
+            self.send_body(200, data, split_image.Image.MIME.get(format_name, 'application/octet-stream'),
+                           (('Cache-Control', 'public, max-age=3600'), ('X-Tile-Cache', 'hit' if hit else 'miss')))
+
+        def log_message(self, format, *args):
+            if self.server.verbose:
+                super().log_message(format, *args)
+
+    return TileHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Server HTTP yang memotong gambar sesuai permintaan")
+    parser.add_argument('--images', default='images', help="folder gambar sumber (default: images)")
+    parser.add_argument('--host', default='127.0.0.1', help="alamat server (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="port server (default: 8000)")
+    parser.add_argument('--source-cache-mb', type=int, default=DEFAULT_SOURCE_CACHE_MB,
+                        help=f"batas cache gambar ter-decode dalam MB (default: {DEFAULT_SOURCE_CACHE_MB})")
+    parser.add_argument('--tile-cache-mb', type=int, default=DEFAULT_TILE_CACHE_MB,
+                        help=f"batas cache potongan ter-encode dalam MB (default: {DEFAULT_TILE_CACHE_MB})")
+    parser.add_argument('-f', '--format', dest='output_format', help="format potongan, mis. webp (default: sama dengan sumber)")
+    parser.add_argument('-p', '--profile', dest='encode_profile', choices=tuple(split_image.ENCODE_PROFILES),
+                        default='fast', help="profil encoding (default: fast)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="tanpa log per permintaan")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.images):
+        print(f"❌ Folder '{args.images}' tidak ditemukan!")
+        return 1
+
+    tile_source = TileSource(args.images, args.source_cache_mb, args.tile_cache_mb,
+                             args.encode_profile, args.output_format)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(tile_source))
+    server.verbose = not args.quiet
+    print(f"🌐 Server tile berjalan di http://{args.host}:{server.server_address[1]}/")
+    print(f"   Contoh: http://{args.host}:{server.server_address[1]}/<gambar>/256x256/1/1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server dihentikan")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())